@@ -26,6 +26,7 @@
         'views/res_config_settings.xml',
         'data/website_data.xml',
         'data/request_type_incident.xml',
+        'data/ir_cron.xml',
     ],
     'demo': [
         'demo/demo_res_users.xml',
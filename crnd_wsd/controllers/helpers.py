@@ -1,9 +1,14 @@
+import os
+import re
 import json
+import uuid
 import base64
+import hashlib
 import logging
+from contextlib import contextmanager
 from werkzeug.urls import url_quote
 
-from odoo import http, tools, _
+from odoo import http, tools, exceptions, _
 from odoo.tools import ustr
 from odoo.http import request
 
@@ -11,30 +16,73 @@ from .controller_mixin import WSDControllerMixin
 
 _logger = logging.getLogger(__name__)
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Not available on Windows, thus concurrent writes of chunks of
+    # same upload are not serialized there
+    fcntl = None
+
+CHUNKED_UPLOAD_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+CHUNKED_UPLOAD_BUFSIZE = 64 * 1024
+# Default max size (in bytes) of chunked upload (same as default max size
+# of upload in web client). Could be changed via system parameter
+# 'crnd_wsd.chunked_upload_max_size'
+CHUNKED_UPLOAD_MAX_SIZE = 128 * 1024 * 1024
+
 
 class WSDHelpers(WSDControllerMixin, http.Controller):
 
-    @http.route('/crnd_wsd/file_upload', type='http',
-                auth='user', methods=['POST'], website=True)
-    def wsd_upload_file(self, upload, alt='File', filename=None,
-                        is_image=False, **post_data):
-        Attachments = request.env['ir.attachment'].sudo()
+    def _wsd_upload_prepare_attachment_data(self, alt, filename,
+                                            request_id=None):
         attachment_data = {
             'description': alt,
             'name': filename or 'upload',
             'public': False,
         }
 
-        if post_data.get('request_id'):
+        if request_id:
             try:
-                attachment_data['res_id'] = int(post_data.get('request_id'))
+                attachment_data['res_id'] = int(request_id)
             except (ValueError, TypeError):
                 _logger.debug(
                     "Cannon convert request_id %r",
-                    post_data.get('request_id'),
+                    request_id,
                     exc_info=True)
             else:
                 attachment_data['res_model'] = 'request.request'
+        return attachment_data
+
+    def _wsd_upload_prepare_response(self, attachment, is_image):
+        attachment.generate_access_token()
+        if is_image:
+            attachment_url = "%s?access_token=%s" % (
+                url_quote("/web/image/%d/%s" % (
+                    attachment.id,
+                    attachment.name)),
+                attachment.sudo().access_token,
+            )
+        else:
+            attachment_url = "%s?access_token=%s&download" % (
+                url_quote("/web/content/%d/%s" % (
+                    attachment.id,
+                    attachment.name)),
+                attachment.sudo().access_token,
+            )
+
+        return json.dumps({
+            'status': 'OK',
+            'success': True,
+            'attachment_url': attachment_url,
+        })
+
+    @http.route('/crnd_wsd/file_upload', type='http',
+                auth='user', methods=['POST'], website=True)
+    def wsd_upload_file(self, upload, alt='File', filename=None,
+                        is_image=False, **post_data):
+        Attachments = request.env['ir.attachment'].sudo()
+        attachment_data = self._wsd_upload_prepare_attachment_data(
+            alt, filename, post_data.get('request_id'))
 
         try:
             data = upload.read()
@@ -57,28 +105,259 @@ class WSDHelpers(WSDControllerMixin, http.Controller):
                 'message': message,
             })
 
-        attachment.generate_access_token()
-        if is_image:
-            attachment_url = "%s?access_token=%s" % (
-                url_quote("/web/image/%d/%s" % (
-                    attachment.id,
-                    attachment.name)),
-                attachment.sudo().access_token,
-            )
-        else:
-            attachment_url = "%s?access_token=%s&download" % (
-                url_quote("/web/content/%d/%s" % (
-                    attachment.id,
-                    attachment.name)),
-                attachment.sudo().access_token,
-            )
+        return self._wsd_upload_prepare_response(attachment, is_image)
+
+    # Chunked uploads.
+    #
+    # Client starts upload by sending first chunk without 'upload_id'.
+    # Server responds with generated 'upload_id' and current 'offset',
+    # and client sends next chunks with this 'upload_id' and 'offset'.
+    # Current offset of interrupted upload could be requested via
+    # '/crnd_wsd/file_upload/chunked/status' to resume it.
+    # When all chunks are sent, client calls
+    # '/crnd_wsd/file_upload/chunked/done' (optionally passing SHA1 checksum
+    # of whole file), and only then attachment is created.
+    def _wsd_chunked_upload_get_dir(self):
+        """ Return directory to store chunked uploads of current user
+        """
+        upload_dir = os.path.join(
+            request.env['ir.attachment']._wsd_chunked_upload_get_root(),
+            str(request.env.uid))
+        if not os.path.isdir(upload_dir):
+            os.makedirs(upload_dir)
+        return upload_dir
+
+    def _wsd_chunked_upload_get_paths(self, upload_id):
+        """ Return tuple (data_path, meta_path) for specified upload.
+            If upload does not exist, then return None
+        """
+        if not upload_id or not CHUNKED_UPLOAD_ID_RE.match(upload_id):
+            return None
+        upload_dir = self._wsd_chunked_upload_get_dir()
+        data_path = os.path.join(upload_dir, '%s.part' % upload_id)
+        meta_path = os.path.join(upload_dir, '%s.json' % upload_id)
+        if not os.path.isfile(data_path) or not os.path.isfile(meta_path):
+            return None
+        return data_path, meta_path
+
+    def _wsd_chunked_upload_cleanup(self):
+        """ Remove outdated incomplete uploads of current user.
+            Uploads of all users are cleaned up by scheduler too.
+        """
+        request.env['ir.attachment']._wsd_chunked_upload_cleanup_dir(
+            self._wsd_chunked_upload_get_dir())
+
+    def _wsd_chunked_upload_remove(self, paths):
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                _logger.debug(
+                    "Cannot remove upload file %r", path, exc_info=True)
+
+    def _wsd_chunked_upload_get_max_size(self):
+        """ Return max allowed size (in bytes) of chunked upload
+        """
+        return int(request.env['ir.config_parameter'].sudo().get_param(
+            'crnd_wsd.chunked_upload_max_size', CHUNKED_UPLOAD_MAX_SIZE))
+
+    @contextmanager
+    def _wsd_chunked_upload_open(self, data_path):
+        """ Open data file of upload for appending and lock it,
+            thus chunks of same upload sent concurrently are written
+            one by one. Lock is released when file is closed.
+        """
+        with open(data_path, 'ab') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield f
+
+    def _wsd_chunked_upload_write(self, upload, f, max_size):
+        """ Append data of chunk to opened upload file.
+
+            :return bool: False if upload exceeds max_size. In this case
+                          data of chunk is not written.
+        """
+        start = size = os.fstat(f.fileno()).st_size
+        for data in iter(lambda: upload.read(CHUNKED_UPLOAD_BUFSIZE), b''):
+            size += len(data)
+            if size > max_size:
+                f.truncate(start)
+                return False
+            f.write(data)
+        return True
 
+    def _wsd_chunked_upload_response(self, upload_id, offset,
+                                     status='OK', message=None):
         return json.dumps({
-            'status': 'OK',
-            'success': True,
-            'attachment_url': attachment_url,
+            'status': status,
+            'success': status == 'OK',
+            'upload_id': upload_id,
+            'offset': offset,
+            'message': message,
         })
 
+    def _wsd_chunked_upload_checksum(self, data_path):
+        """ Compute SHA1 checksum of uploaded file without loading it
+            to memory.
+        """
+        sha = hashlib.sha1()
+        with open(data_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNKED_UPLOAD_BUFSIZE), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def _wsd_chunked_upload_check_request_access(self, attachment_data):
+        """ Check that current user can write to request, attachment
+            will be linked to. Request id comes from client, and
+            attachment is created with sudo, thus it have to be checked.
+        """
+        if attachment_data.get('res_model') != 'request.request':
+            return
+        req = request.env['request.request'].browse(
+            attachment_data['res_id']).exists()
+        if not req:
+            raise exceptions.UserError(_("Request not found"))
+        req.check_access_rights('write')
+        req.check_access_rule('write')
+
+    def _wsd_chunked_upload_create_attachment(self, data_path, meta):
+        """ Create attachment from completed upload.
+
+            Attachment is created via regular 'ir.attachment' API, thus
+            mimetype, index content, checksum and file size are computed
+            by Odoo. Size of upload is limited by
+            '_wsd_chunked_upload_get_max_size'.
+        """
+        Attachments = request.env['ir.attachment'].sudo()
+        attachment_data = self._wsd_upload_prepare_attachment_data(
+            meta['alt'], meta['filename'], meta['request_id'])
+        self._wsd_chunked_upload_check_request_access(attachment_data)
+
+        with open(data_path, 'rb') as f:
+            data = f.read()
+        if meta['is_image']:
+            attachment_data['datas'] = tools.image_process(
+                base64.b64encode(data), verify_resolution=True)
+        else:
+            attachment_data['raw'] = data
+        attachment = Attachments.create(attachment_data)
+        os.unlink(data_path)
+        return attachment
+
+    @http.route('/crnd_wsd/file_upload/chunked', type='http',
+                auth='user', methods=['POST'], website=True)
+    def wsd_upload_file_chunk(self, upload, upload_id=None, offset=0,
+                              alt='File', filename=None, is_image=False,
+                              **post_data):
+        """ Upload single chunk of file.
+
+            Data of chunk is streamed directly to file in filestore.
+        """
+        if upload_id:
+            paths = self._wsd_chunked_upload_get_paths(upload_id)
+            if not paths:
+                return self._wsd_chunked_upload_response(
+                    upload_id, 0, status='FAIL',
+                    message=_("Upload not found"))
+        else:
+            self._wsd_chunked_upload_cleanup()
+            upload_id = uuid.uuid4().hex
+            upload_dir = self._wsd_chunked_upload_get_dir()
+            paths = (
+                os.path.join(upload_dir, '%s.part' % upload_id),
+                os.path.join(upload_dir, '%s.json' % upload_id),
+            )
+            with open(paths[1], 'wt') as f:
+                json.dump({
+                    'alt': alt,
+                    'filename': filename,
+                    'is_image': bool(is_image),
+                    'request_id': post_data.get('request_id'),
+                }, f)
+            open(paths[0], 'wb').close()
+
+        try:
+            offset = int(offset)
+        except (ValueError, TypeError):
+            offset = None
+
+        max_size = self._wsd_chunked_upload_get_max_size()
+        with self._wsd_chunked_upload_open(paths[0]) as f:
+            current_offset = os.fstat(f.fileno()).st_size
+            if offset != current_offset:
+                # Client have to continue upload from current offset
+                return self._wsd_chunked_upload_response(
+                    upload_id, current_offset, status='OFFSET_MISMATCH')
+
+            too_large = not self._wsd_chunked_upload_write(
+                upload, f, max_size)
+            f.flush()
+            current_offset = os.fstat(f.fileno()).st_size
+
+        if too_large:
+            self._wsd_chunked_upload_remove(paths)
+            return self._wsd_chunked_upload_response(
+                upload_id, 0, status='FAIL',
+                message=_("File is too large. Max allowed size is %s MB"
+                          ) % (max_size // (1024 * 1024)))
+        return self._wsd_chunked_upload_response(upload_id, current_offset)
+
+    @http.route('/crnd_wsd/file_upload/chunked/status', type='http',
+                auth='user', methods=['POST'], website=True)
+    def wsd_upload_file_chunk_status(self, upload_id, **post_data):
+        """ Return current offset of upload, to resume it
+        """
+        paths = self._wsd_chunked_upload_get_paths(upload_id)
+        if not paths:
+            return self._wsd_chunked_upload_response(
+                upload_id, 0, status='FAIL', message=_("Upload not found"))
+        return self._wsd_chunked_upload_response(
+            upload_id, os.path.getsize(paths[0]))
+
+    @http.route('/crnd_wsd/file_upload/chunked/done', type='http',
+                auth='user', methods=['POST'], website=True)
+    def wsd_upload_file_chunk_done(self, upload_id, checksum=None,
+                                   **post_data):
+        """ Complete upload and create attachment.
+
+            :param str checksum: optional SHA1 hex digest of whole file.
+                                 If it does not match uploaded data,
+                                 then upload is removed.
+        """
+        paths = self._wsd_chunked_upload_get_paths(upload_id)
+        if not paths:
+            return self._wsd_chunked_upload_response(
+                upload_id, 0, status='FAIL', message=_("Upload not found"))
+        data_path, meta_path = paths
+
+        if checksum:
+            data_checksum = self._wsd_chunked_upload_checksum(data_path)
+            if data_checksum != checksum.lower():
+                self._wsd_chunked_upload_remove(paths)
+                return self._wsd_chunked_upload_response(
+                    upload_id, 0, status='FAIL',
+                    message=_("Checksum mismatch"))
+
+        with open(meta_path, 'rt') as f:
+            meta = json.load(f)
+
+        try:
+            attachment = self._wsd_chunked_upload_create_attachment(
+                data_path, meta)
+        except Exception as e:
+            _logger.exception("Failed to upload file to attachment")
+            self._wsd_chunked_upload_remove(paths)
+            return json.dumps({
+                'status': 'FAIL',
+                'success': False,
+                'message': ustr(e),
+            })
+
+        self._wsd_chunked_upload_remove([meta_path])
+        return self._wsd_upload_prepare_response(
+            attachment, meta['is_image'])
+
     @http.route('/crnd_wsd/api/request/update-text', type='json',
                 auth='user', methods=['POST'], website=True)
     def wsd_request_update_text(self, request_id, request_text):
@@ -4,7 +4,7 @@ import functools
 import werkzeug
 
 from odoo import _
-from odoo import http
+from odoo import http, fields
 from odoo.http import request
 from odoo.tools import ustr
 from odoo.osv import expression
@@ -22,6 +22,10 @@ GROUP_USER_ADVANCED = (
 
 ITEMS_PER_PAGE = 20
 
+# Order used for keyset pagination of request list.
+# Must be unique, thus 'id' is included.
+REQUESTS_KEYSET_ORDER = 'date_created DESC, id DESC'
+
 
 # NOTE: here is name collision with request, so be careful, when use name
 # `request`. To avoid this name collision use names `req` and reqs` for
@@ -139,6 +143,16 @@ class WebsiteRequest(WSDControllerMixin, http.Controller):
             ],
         }
 
+    def _requests_get_request_counts(self, search, **post):
+        """ Return counters for tabs of request list.
+
+            Counters for domains of all tabs
+            (see '_requests_get_request_domains') are computed by single
+            query, and cached for short time.
+        """
+        return request.env['request.request'].wsd_get_request_counts(
+            self._requests_get_request_domains(search, **post))
+
     def _requests_list_get_extra_context(self, req_status, search, **post):
         selected_request_kind = self._id_to_record(
             'request.kind', post.get('kind_id'), no_raise=True)
@@ -155,46 +169,121 @@ class WebsiteRequest(WSDControllerMixin, http.Controller):
     def _request_page_get_extra_context(self, req_id, **post):
         return {}
 
+    def _requests_parse_cursor(self, cursor):
+        """ Parse cursor of request list page.
+
+            :param str cursor: cursor in format '<date_created>,<id>'
+            :return tuple: (date_created, id) or None if cursor is not valid
+        """
+        try:
+            date_created, req_id = cursor.split(',', 1)
+            return fields.Datetime.to_datetime(date_created), int(req_id)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def _requests_make_cursor(self, req):
+        return '%s,%s' % (
+            fields.Datetime.to_string(req.date_created), req.id)
+
+    def _requests_search_keyset(self, domain, after=None, before=None):
+        """ Find requests for page of request list using keyset pagination
+            on (date_created, id). This way, deep pages are as fast as
+            first one, because there is no need to scan and skip records
+            of previous pages.
+
+            :param list domain: domain to search requests
+            :param str after: cursor of last request on previous page
+            :param str before: cursor of first request on next page
+            :return tuple: (requests, has_previous_page, has_next_page)
+        """
+        Request = request.env['request.request']
+        after = self._requests_parse_cursor(after) if after else None
+        before = self._requests_parse_cursor(before) if before else None
+
+        if before and not after:
+            date_created, req_id = before
+            reqs = Request.search(
+                expression.AND([domain, [
+                    '|', ('date_created', '>', date_created),
+                    '&', ('date_created', '=', date_created),
+                    ('id', '>', req_id),
+                ]]),
+                order='date_created ASC, id ASC', limit=ITEMS_PER_PAGE + 1)
+            has_prev = len(reqs) > ITEMS_PER_PAGE
+            reqs = Request.browse(reqs.ids[:ITEMS_PER_PAGE][::-1])
+            return reqs, has_prev, True
+
+        if after:
+            date_created, req_id = after
+            domain = expression.AND([domain, [
+                '|', ('date_created', '<', date_created),
+                '&', ('date_created', '=', date_created),
+                ('id', '<', req_id),
+            ]])
+        reqs = Request.search(
+            domain, order=REQUESTS_KEYSET_ORDER, limit=ITEMS_PER_PAGE + 1)
+        has_next = len(reqs) > ITEMS_PER_PAGE
+        return reqs[:ITEMS_PER_PAGE], bool(after), has_next
+
+    def _requests_get_keyset_pager(self, keep, url, reqs, has_prev,
+                                   has_next, total):
+        """ Prepare data for keyset pager of request list
+        """
+        return {
+            'first_url': keep(url) if has_prev else None,
+            'prev_url': (
+                keep(url, before=self._requests_make_cursor(reqs[0]))
+                if has_prev and reqs else None),
+            'next_url': (
+                keep(url, after=self._requests_make_cursor(reqs[-1]))
+                if has_next and reqs else None),
+            'total_estimate': total,
+        }
+
     @http.route(['/requests',
                  '/requests/<string:req_status>',
                  '/requests/<string:req_status>/page/<int:page>'],
                 type='http', auth="public", website=True)
     @guard_access
-    def requests(self, req_status='my', page=0, search="", **post):
+    def requests(self, req_status='my', page=0, search="", after=None,
+                 before=None, **post):
         if req_status not in ('my', 'open', 'closed', 'all'):
             return request.not_found()
 
-        Request = request.env['request.request']
-
         url = '/requests/' + req_status
         keep = QueryURL(
             url, [], search=search, **post)
         domains = self._requests_get_request_domains(search, **post)
 
-        req_count = {
-            'all': Request.search_count(domains['all']),
-            'open': Request.search_count(domains['open']),
-            'closed': Request.search_count(domains['closed']),
-            'my': Request.search_count(domains['my']),
-        }
-
-        # make pager
-        pager = request.website.pager(
-            url=url,
-            total=req_count[req_status],
-            page=page,
-            step=ITEMS_PER_PAGE,
-            url_args=dict(
-                post, search=search),
-        )
+        # Counters are cached for short time, thus they are used as
+        # estimate of total number of requests for pager.
+        req_count = self._requests_get_request_counts(search, **post)
+
+        pager = keyset_pager = None
+        if page:
+            # Keep old page-based urls working
+            pager = request.website.pager(
+                url=url,
+                total=req_count[req_status],
+                page=page,
+                step=ITEMS_PER_PAGE,
+                url_args=dict(
+                    post, search=search),
+            )
+            reqs = request.env['request.request'].search(
+                domains[req_status], limit=ITEMS_PER_PAGE,
+                offset=pager['offset'])
+        else:
+            reqs, has_prev, has_next = self._requests_search_keyset(
+                domains[req_status], after=after, before=before)
+            keyset_pager = self._requests_get_keyset_pager(
+                keep, url, reqs, has_prev, has_next, req_count[req_status])
 
-        # search the count to display, according to the pager data
-        reqs = request.env['request.request'].search(
-            domains[req_status], limit=ITEMS_PER_PAGE, offset=pager['offset'])
         values = {
             'search': search,
             'reqs': reqs.sudo(),
             'pager': pager,
+            'keyset_pager': keyset_pager,
             'default_url': url,
             'req_status': req_status,
             'req_count': req_count,
@@ -209,35 +298,8 @@ class WebsiteRequest(WSDControllerMixin, http.Controller):
             'crnd_wsd.wsd_requests', values)
 
     def _request_get_available_routes(self, req, **post):
-        Route = http.request.env['request.stage.route']
-        result = Route.browse()
-
-        user = http.request.env.user
-        group_ids = user.sudo().groups_id.ids
-        action_routes = Route.search(expression.AND([
-            [('request_type_id', '=', req.sudo().type_id.id)],
-            [('stage_from_id', '=', req.sudo().stage_id.id)],
-            [('website_published', '=', True)],
-            expression.OR([
-                [('allowed_user_ids', '=', False)],
-                [('allowed_user_ids', '=', user.id)],
-            ]),
-            expression.OR([
-                [('allowed_group_ids', '=', False)],
-                [('allowed_group_ids', 'in', group_ids)],
-            ]),
-        ]))
-
-        for route in action_routes:
-            try:
-                route._ensure_can_move(req)
-            except AccessError:  # pylint: disable=except-pass
-                pass
-            except ValidationError:  # pylint: disable=except-pass
-                pass
-            else:
-                result += route
-        return result
+        return http.request.env[
+            'request.stage.route']._wsd_get_available_routes(req)
 
     @http.route(["/requests/request/<int:req_id>"],
                 type='http', auth="user", website=True)
@@ -7,4 +7,5 @@ from . import (
     ir_http,
     res_company,
     res_config_settings,
+    ir_attachment,
 )
@@ -0,0 +1,51 @@
+import os
+import time
+import logging
+
+from odoo import models, api
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+# Chunked uploads are stored in this directory inside filestore
+# of database, until upload is completed
+CHUNKED_UPLOAD_DIR = 'crnd_wsd_uploads'
+# Incomplete uploads older then this (in seconds) are removed
+CHUNKED_UPLOAD_MAX_AGE = 24 * 3600
+
+
+class IrAttachment(models.Model):
+    _inherit = 'ir.attachment'
+
+    @api.model
+    def _wsd_chunked_upload_get_root(self):
+        """ Return directory, that contains chunked uploads of all users
+        """
+        return os.path.join(
+            config.filestore(self.env.cr.dbname), CHUNKED_UPLOAD_DIR)
+
+    @api.model
+    def _wsd_chunked_upload_cleanup_dir(self, upload_dir):
+        """ Remove outdated incomplete uploads from directory
+        """
+        max_mtime = time.time() - CHUNKED_UPLOAD_MAX_AGE
+        for fname in os.listdir(upload_dir):
+            path = os.path.join(upload_dir, fname)
+            try:
+                if os.path.getmtime(path) < max_mtime:
+                    os.unlink(path)
+            except OSError:
+                _logger.debug(
+                    "Cannot remove outdated upload %r", path, exc_info=True)
+
+    @api.model
+    def _scheduler_wsd_cleanup_chunked_uploads(self):
+        """ Remove outdated incomplete chunked uploads of all users
+        """
+        root = self._wsd_chunked_upload_get_root()
+        if not os.path.isdir(root):
+            return
+        for user_dir in os.listdir(root):
+            upload_dir = os.path.join(root, user_dir)
+            if os.path.isdir(upload_dir):
+                self._wsd_chunked_upload_cleanup_dir(upload_dir)
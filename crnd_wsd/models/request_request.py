@@ -1,5 +1,17 @@
 import re
-from odoo import models, fields
+
+from odoo import models, fields, api, tools
+
+from odoo.addons.generic_mixin.tools.ttl_cache import (
+    TTLCache,
+    env_cache_key,
+)
+
+# Counters of website request list tabs
+# (see 'RequestRequest.wsd_get_request_counts') are cached per worker
+# for WSD_REQUEST_COUNTS_TTL seconds
+WSD_REQUEST_COUNTS_TTL = 30
+_wsd_request_counts_cache = TTLCache(WSD_REQUEST_COUNTS_TTL, size=4096)
 
 
 class RequestRequest(models.Model):
@@ -22,6 +34,17 @@ class RequestRequest(models.Model):
         "Closed By (Avatar)", related='closed_by_id.image_128')
     website_id = fields.Many2one('website')
 
+    def init(self):
+        res = super(RequestRequest, self).init()
+
+        # Index used by keyset pagination of website request list
+        index_name = '%s_date_created_id_desc_index' % self._table
+        if not tools.index_exists(self.env.cr, index_name):
+            tools.create_index(
+                self.env.cr, index_name, self._table,
+                ['date_created DESC', 'id DESC'])
+        return res
+
     def _compute_access_url(self):
         res = super(RequestRequest, self)._compute_access_url()
         for request in self:
@@ -84,3 +107,46 @@ class RequestRequest(models.Model):
             'url': self.access_url,
             'target': 'self',
         }
+
+    @api.model
+    def _wsd_get_request_counts(self, domains):
+        """ Compute counters for tabs of website request list
+            with single query.
+
+            :param dict domains: {tab: domain}
+            :return dict: {tab: number of requests matching domain}
+        """
+        self.check_access_rights('read')
+        self.flush()
+        tabs = sorted(domains)
+        counters = []
+        params = []
+        for tab in tabs:
+            query = self._where_calc(domains[tab])
+            self._apply_ir_rules(query, 'read')
+            from_clause, where_clause, where_params = query.get_sql()
+            counters.append(
+                '(SELECT COUNT(1) FROM %s WHERE %s)' % (
+                    from_clause, where_clause or 'TRUE'))
+            params += where_params
+
+        # pylint: disable=sql-injection
+        self.env.cr.execute(
+            'SELECT %s' % ', '.join(counters), params)  # nosec
+        return dict(zip(tabs, self.env.cr.fetchone()))
+
+    @api.model
+    def wsd_get_request_counts(self, domains):
+        """ Return counters for tabs of website request list.
+
+            Results are cached for short time (WSD_REQUEST_COUNTS_TTL seconds)
+            per user, language and domains, and are not invalidated on
+            changes of requests, thus counters could be outdated
+            for this time.
+
+            :param dict domains: {tab: domain}
+            :return dict: {tab: number of requests matching domain}
+        """
+        return dict(_wsd_request_counts_cache.get_or_compute(
+            env_cache_key(self.env, repr(sorted(domains.items()))),
+            lambda: self._wsd_get_request_counts(domains)))
@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import models, fields, api, tools, exceptions
 
 
 class RequestStageRoute(models.Model):
@@ -27,3 +27,74 @@ class RequestStageRoute(models.Model):
         for rec in self:
             rec.website_published = not rec.website_published
         return True
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super(RequestStageRoute, self).create(vals_list)
+        self.clear_caches()
+        return res
+
+    def write(self, vals):
+        res = super(RequestStageRoute, self).write(vals)
+        self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super(RequestStageRoute, self).unlink()
+        self.clear_caches()
+        return res
+
+    @api.model
+    @tools.ormcache('request_type_id', 'stage_from_id')
+    def _wsd_get_route_acl_matrix(self, request_type_id, stage_from_id):
+        """ Return access matrix for website published routes
+            from specified stage of specified request type.
+
+            :return tuple: tuple of (route_id, allowed_group_ids,
+                           allowed_user_ids), where allowed ids are
+                           frozensets (empty means no restriction)
+        """
+        routes = self.sudo().search([
+            ('request_type_id', '=', request_type_id),
+            ('stage_from_id', '=', stage_from_id),
+            ('website_published', '=', True),
+        ])
+        return tuple(
+            (route.id,
+             frozenset(route.allowed_group_ids.ids),
+             frozenset(route.allowed_user_ids.ids))
+            for route in routes
+        )
+
+    @api.model
+    def _wsd_get_available_routes(self, request):
+        """ Return website published routes, that current user can use
+            to move request from its current stage.
+
+            Cached access matrix (see '_wsd_get_route_acl_matrix') is used
+            only to prefilter routes. Then record rules and
+            '_ensure_can_move' are checked for each candidate route,
+            thus overrides of '_ensure_can_move' are respected.
+        """
+        self.check_access_rights('read')
+        matrix = self._wsd_get_route_acl_matrix(
+            request.sudo().type_id.id, request.sudo().stage_id.id)
+
+        uid = self.env.uid
+        group_ids = set(self.env.user.sudo().groups_id.ids)
+        candidates = self.browse([
+            route_id
+            for route_id, allowed_group_ids, allowed_user_ids in matrix
+            if self.env.su or (
+                (not allowed_user_ids or uid in allowed_user_ids) and
+                (not allowed_group_ids or allowed_group_ids & group_ids))
+        ])._filter_access_rules('read')
+
+        result = self.browse()
+        for route in candidates:
+            try:
+                route._ensure_can_move(request)
+            except (exceptions.AccessError, exceptions.ValidationError):
+                continue
+            result += route
+        return result
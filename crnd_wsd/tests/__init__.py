@@ -2,4 +2,5 @@ from . import (
     test_tour,
     test_mail,
     test_upload_file,
+    test_website_requests,
 )
@@ -145,3 +145,145 @@ class TestUploadFile(TestPhantomTour):
             [('res_model', '=', 'request.request'),
              ('res_id', '=', test_request.id)])
         self.assertEqual(len(attachments), 2)
+
+    def test_upload_file_chunked(self):
+        self.authenticate('demo-sd-website', 'demo-sd-website')  # nosec
+        test_request = self.env['request.request'].search(
+            [('created_by_id', '=', self.user.id)], limit=1)
+        with open('crnd_wsd/static/description/index.html', 'rb') as f:
+            content = f.read()
+        chunk_size = len(content) // 2 + 1
+        url = "%s/crnd_wsd/file_upload/chunked" % TEST_URL
+
+        # Upload first chunk
+        response = self.opener.post(url=url, data={
+            'csrf_token': self.get_csrf_token(),
+            'request_id': test_request.id,
+            'filename': 'index.html',
+            'offset': 0,
+        }, files={'upload': content[:chunk_size]})
+        response_json = response.json()
+        self.assertEqual(response_json['status'], 'OK')
+        self.assertEqual(response_json['offset'], chunk_size)
+        upload_id = response_json['upload_id']
+
+        # Resume upload
+        response = self.opener.post(url=url + '/status', data={
+            'csrf_token': self.get_csrf_token(),
+            'upload_id': upload_id,
+        })
+        self.assertEqual(response.json()['offset'], chunk_size)
+
+        # Chunk with wrong offset is rejected
+        response = self.opener.post(url=url, data={
+            'csrf_token': self.get_csrf_token(),
+            'upload_id': upload_id,
+            'offset': 0,
+        }, files={'upload': content[:chunk_size]})
+        response_json = response.json()
+        self.assertEqual(response_json['status'], 'OFFSET_MISMATCH')
+        self.assertEqual(response_json['offset'], chunk_size)
+
+        # Upload last chunk
+        response = self.opener.post(url=url, data={
+            'csrf_token': self.get_csrf_token(),
+            'upload_id': upload_id,
+            'offset': chunk_size,
+        }, files={'upload': content[chunk_size:]})
+        response_json = response.json()
+        self.assertEqual(response_json['status'], 'OK')
+        self.assertEqual(response_json['offset'], len(content))
+
+        # No attachment created before upload is completed
+        attachments = self.env['ir.attachment'].search(
+            [('res_model', '=', 'request.request'),
+             ('res_id', '=', test_request.id)])
+        self.assertFalse(attachments)
+
+        response = self.opener.post(url=url + '/done', data={
+            'csrf_token': self.get_csrf_token(),
+            'upload_id': upload_id,
+            'checksum': hashlib.sha1(content).hexdigest(),
+        })
+        response_json = response.json()
+        self.assertEqual(response_json['status'], 'OK')
+        attachment_url_file = response_json['attachment_url']
+        response_attachment = self.opener.get(
+            "%s%s" % (TEST_URL, attachment_url_file))
+        self.assertEqual(response_attachment.status_code, 200)
+        self.assertEqual(response_attachment.content, content)
+
+        attachments = self.env['ir.attachment'].search(
+            [('res_model', '=', 'request.request'),
+             ('res_id', '=', test_request.id)])
+        self.assertEqual(len(attachments), 1)
+        self.assertEqual(attachments.raw, content)
+
+        # Upload with wrong checksum is rejected
+        response = self.opener.post(url=url, data={
+            'csrf_token': self.get_csrf_token(),
+            'offset': 0,
+        }, files={'upload': content})
+        upload_id = response.json()['upload_id']
+        response = self.opener.post(url=url + '/done', data={
+            'csrf_token': self.get_csrf_token(),
+            'upload_id': upload_id,
+            'checksum': '0' * 40,
+        })
+        self.assertEqual(response.json()['status'], 'FAIL')
+
+    def test_upload_file_chunked_max_size(self):
+        self.authenticate('demo-sd-website', 'demo-sd-website')  # nosec
+        self.env['ir.config_parameter'].sudo().set_param(
+            'crnd_wsd.chunked_upload_max_size', 10)
+        url = "%s/crnd_wsd/file_upload/chunked" % TEST_URL
+
+        response = self.opener.post(url=url, data={
+            'csrf_token': self.get_csrf_token(),
+            'filename': 'test.txt',
+            'offset': 0,
+        }, files={'upload': b'0123456789'})
+        response_json = response.json()
+        self.assertEqual(response_json['status'], 'OK')
+        self.assertEqual(response_json['offset'], 10)
+        upload_id = response_json['upload_id']
+
+        # Upload that exceeds max size is removed
+        response = self.opener.post(url=url, data={
+            'csrf_token': self.get_csrf_token(),
+            'upload_id': upload_id,
+            'offset': 10,
+        }, files={'upload': b'a'})
+        self.assertEqual(response.json()['status'], 'FAIL')
+
+        response = self.opener.post(url=url + '/status', data={
+            'csrf_token': self.get_csrf_token(),
+            'upload_id': upload_id,
+        })
+        self.assertEqual(response.json()['status'], 'FAIL')
+
+    def test_upload_file_chunked_request_access(self):
+        self.authenticate('demo-sd-website', 'demo-sd-website')  # nosec
+        other_request = self.env['request.request'].create({
+            'type_id': self.request_type.id,
+            'request_text': 'Request not available for website user',
+        })
+        url = "%s/crnd_wsd/file_upload/chunked" % TEST_URL
+
+        response = self.opener.post(url=url, data={
+            'csrf_token': self.get_csrf_token(),
+            'request_id': other_request.id,
+            'filename': 'test.txt',
+            'offset': 0,
+        }, files={'upload': b'test'})
+        upload_id = response.json()['upload_id']
+
+        # Attachment is not created for request, user cannot write to
+        response = self.opener.post(url=url + '/done', data={
+            'csrf_token': self.get_csrf_token(),
+            'upload_id': upload_id,
+        })
+        self.assertEqual(response.json()['status'], 'FAIL')
+        self.assertFalse(self.env['ir.attachment'].search([
+            ('res_model', '=', 'request.request'),
+            ('res_id', '=', other_request.id)]))
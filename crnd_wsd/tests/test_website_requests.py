@@ -0,0 +1,158 @@
+from odoo import fields, exceptions
+from odoo.addons.generic_request.tests.common import RequestCase
+from ..models.request_request import _wsd_request_counts_cache
+from .phantom_common import TestPhantomTour
+
+
+class TestWebsiteRequests(RequestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestWebsiteRequests, cls).setUpClass()
+        cls.wsd_user = cls.env.ref('crnd_wsd.user_demo_service_desk_website')
+        cls.request_type = cls.env.ref(
+            'crnd_service_desk.request_type_incident')
+
+    def _get_domains(self, Request, domain):
+        user = Request.env.user
+        return {
+            'all': domain,
+            'open': domain + [('closed', '=', False)],
+            'closed': domain + [('closed', '=', True)],
+            'my': domain + [
+                ('closed', '=', False),
+                '|', '|',
+                ('user_id', '=', user.id),
+                ('created_by_id', '=', user.id),
+                ('author_id', '=', user.partner_id.id),
+            ],
+        }
+
+    def test_request_counts(self):
+        Request = self.env['request.request'].with_user(self.wsd_user)
+        domains = self._get_domains(Request, [('website_id', '=', False)])
+        expected = {
+            tab: Request.search_count(domain)
+            for tab, domain in domains.items()
+        }
+
+        _wsd_request_counts_cache.clear()
+        counts = Request.wsd_get_request_counts(domains)
+        self.assertEqual(counts, expected)
+
+        # Counters are cached for short time
+        Request.create({
+            'type_id': self.request_type.id,
+            'request_text': 'Test request counts',
+        })
+        self.assertEqual(Request.wsd_get_request_counts(domains), counts)
+
+        _wsd_request_counts_cache.clear()
+        new_counts = Request.wsd_get_request_counts(domains)
+        self.assertEqual(new_counts, {
+            tab: Request.search_count(domain)
+            for tab, domain in domains.items()
+        })
+        self.assertEqual(new_counts['all'], counts['all'] + 1)
+        self.assertEqual(new_counts['my'], counts['my'] + 1)
+
+        # Domains of tabs could be changed (for example by overrides
+        # of '_requests_get_request_domains' in controller)
+        domains['urgent'] = domains['open'] + [
+            ('priority', '=', '5')]
+        counts = Request.wsd_get_request_counts(domains)
+        self.assertEqual(
+            counts['urgent'], Request.search_count(domains['urgent']))
+
+    def test_available_routes(self):
+        Route = self.env['request.stage.route'].with_user(self.wsd_user)
+        request = self.env['request.request'].create({
+            'type_id': self.simple_type.id,
+            'request_text': 'Test available routes',
+        })
+        self.assertEqual(request.stage_id, self.stage_draft)
+        self.route_draft_to_sent.write({
+            'website_published': True,
+            'allowed_user_ids': [(5, 0)],
+            'allowed_group_ids': [(5, 0)],
+        })
+        self.assertIn(
+            self.route_draft_to_sent,
+            Route._wsd_get_available_routes(request))
+
+        # Access matrix have to be updated on route change
+        self.route_draft_to_sent.allowed_user_ids = [
+            (6, 0, [self.env.ref('base.user_admin').id])]
+        self.assertNotIn(
+            self.route_draft_to_sent,
+            Route._wsd_get_available_routes(request))
+
+        self.route_draft_to_sent.write({
+            'allowed_user_ids': [(5, 0)],
+            'allowed_group_ids': [
+                (6, 0, [self.env.ref('base.group_system').id])],
+        })
+        self.assertNotIn(
+            self.route_draft_to_sent,
+            Route._wsd_get_available_routes(request))
+
+        self.route_draft_to_sent.allowed_group_ids = [
+            (4, self.env.ref('base.group_portal').id)]
+        self.assertEqual(
+            bool(self.wsd_user.has_group('base.group_portal')),
+            self.route_draft_to_sent in Route._wsd_get_available_routes(
+                request))
+
+        # Overrides of '_ensure_can_move' are respected
+        self.route_draft_to_sent.write({
+            'allowed_user_ids': [(5, 0)],
+            'allowed_group_ids': [(5, 0)],
+        })
+        self.assertIn(
+            self.route_draft_to_sent,
+            Route._wsd_get_available_routes(request))
+
+        def _ensure_can_move(route, req):
+            raise exceptions.AccessError("Test")
+
+        Route._patch_method('_ensure_can_move', _ensure_can_move)
+        try:
+            self.assertNotIn(
+                self.route_draft_to_sent,
+                Route._wsd_get_available_routes(request))
+        finally:
+            Route._revert_method('_ensure_can_move')
+
+        self.route_draft_to_sent.website_published = False
+        self.assertNotIn(
+            self.route_draft_to_sent,
+            Route._wsd_get_available_routes(request))
+
+
+class TestWebsiteRequestsList(TestPhantomTour):
+
+    def test_requests_list_keyset_pagination(self):
+        self.authenticate('demo-sd-website', 'demo-sd-website')  # nosec
+        user = self.env.ref('crnd_wsd.user_demo_service_desk_website')
+        req = self.env['request.request'].with_user(user).search(
+            [], order='date_created DESC, id DESC', limit=1)
+
+        response = self.url_open('/requests/all')
+        self.assertEqual(response.status_code, 200)
+
+        cursor = '%s,%s' % (
+            fields.Datetime.to_string(req.date_created), req.id)
+        response = self.url_open('/requests/all?after=%s' % cursor)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('/requests/request/%s"' % req.id, response.text)
+
+        response = self.url_open('/requests/all?before=%s' % cursor)
+        self.assertEqual(response.status_code, 200)
+
+        # Invalid cursors are ignored
+        response = self.url_open('/requests/all?after=invalid')
+        self.assertEqual(response.status_code, 200)
+
+        # Old page based urls still work
+        response = self.url_open('/requests/all/page/2')
+        self.assertEqual(response.status_code, 200)
@@ -17,7 +17,9 @@
         'http_routing',
     ],
     'data': [
+        'security/ir.model.access.csv',
         'views/assets.xml',
+        'views/generic_mixin_handler_stats.xml',
     ],
     'images': ['static/description/banner.png'],
     'installable': True,
@@ -1,4 +1,5 @@
-from odoo import models, api
+import copy
+from odoo import models, api, tools
 
 
 class GenericMixinGetAction(models.AbstractModel):
@@ -29,6 +30,18 @@ class GenericMixinGetAction(models.AbstractModel):
     _description = "Generic Mixin: Get Action"
     # Note: this mixin is developed primaraly for compatability with 14.0
 
+    @api.model
+    @tools.ormcache('xmlid', 'self.env.lang',
+                    'tuple(self.env.user.groups_id.ids)')
+    def _get_action_by_xmlid_cached(self, xmlid):
+        """ Read action by xmlid. Result is cached per language and
+            user groups (that are used to check access to action).
+
+            Cache is cleared by Odoo on any change of ir.actions.* and
+            ir.model.data records.
+        """
+        return self.env['ir.actions.actions']._for_xml_id(xmlid)
+
     @api.model
     def get_action_by_xmlid(self, xmlid, context=None, domain=None):
         """ Simple method to get action by xmlid and update resulting dict with
@@ -43,7 +56,7 @@ class GenericMixinGetAction(models.AbstractModel):
             :param list domain: apply new domain for action
             :return dict: Data for specified action
         """
-        action = self.env['ir.actions.actions']._for_xml_id(xmlid)
+        action = copy.deepcopy(self._get_action_by_xmlid_cached(xmlid))
         if context is not None:
             action['context'] = context
         if domain is not None:
@@ -0,0 +1,51 @@
+from odoo import models, fields, api
+
+from ..tools import handler_stats
+
+
+class GenericMixinHandlerStats(models.TransientModel):
+    """ Developer report on timing of write and event handlers.
+
+        Stats are collected only when system parameter
+        'generic_mixin.handler_stats' is set to 'True', and only for
+        worker that serves current request.
+    """
+    _name = 'generic.mixin.handler.stats'
+    _description = 'Generic Mixin: Handler Stats'
+    _order = 'total_time DESC'
+
+    model = fields.Char(readonly=True)
+    handler = fields.Char(readonly=True)
+    call_count = fields.Integer('Calls', readonly=True)
+    total_time = fields.Float('Total time (ms)', readonly=True)
+    avg_time = fields.Float('Average time (ms)', readonly=True)
+    query_count = fields.Integer('SQL queries', readonly=True)
+    avg_query_count = fields.Float('Average SQL queries', readonly=True)
+
+    @api.model
+    def action_show_stats(self):
+        """ Build report from stats collected by current worker
+        """
+        records = self.create([{
+            'model': stat['model'],
+            'handler': stat['handler'],
+            'call_count': stat['call_count'],
+            'total_time': stat['total_time'] * 1000.0,
+            'avg_time': stat['total_time'] * 1000.0 / stat['call_count'],
+            'query_count': stat['query_count'],
+            'avg_query_count': (
+                stat['query_count'] / float(stat['call_count'])),
+        } for stat in handler_stats.get_stats()])
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Handler Stats',
+            'res_model': self._name,
+            'view_mode': 'tree',
+            'domain': [('id', 'in', records.ids)],
+            'context': {'search_default_group_by_model': 1},
+        }
+
+    @api.model
+    def action_reset_stats(self):
+        handler_stats.reset_stats()
+        return self.action_show_stats()
@@ -43,30 +43,90 @@ class GenericMixinNameBySequence(models.AbstractModel):
             )
         return res
 
-    def _name_by_sequence_update_name_in_vals(self, vals):
-        """ Set name in values provided to 'create' method
+    @api.model
+    def _name_by_sequence_reserve_names(self, count):
+        """ Generate 'count' names with single database round trip
+            to reserve block of sequence numbers.
+
+            Sequences that use date ranges are processed one by one via
+            standard 'next_by_code' method.
+
+            :return list: list of generated names
+        """
+        fdefault = self._name_by_sequence_get_default_value()
+        fsequence = self._name_by_sequence_sequence_code
+
+        Sequence = self.env['ir.sequence']
+        Sequence.check_access_rights('read')
+        sequence = Sequence.sudo().search([
+            ('code', '=', fsequence),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return [fdefault] * count
+
+        if sequence.use_date_range:
+            return [
+                Sequence.next_by_code(fsequence) or fdefault
+                for __ in range(count)
+            ]
+
+        if sequence.implementation == 'standard':
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ('ir_sequence_%03d' % sequence.id, count))
+            numbers = [r[0] for r in self.env.cr.fetchall()]
+        else:
+            sequence.flush(['number_next', 'number_increment'])
+            self.env.cr.execute("""
+                UPDATE ir_sequence
+                SET number_next = number_next + %(count)s * number_increment
+                WHERE id = %(sequence_id)s
+                RETURNING number_next - %(count)s * number_increment,
+                          number_increment
+            """, {'count': count, 'sequence_id': sequence.id})
+            start, increment = self.env.cr.fetchone()
+            sequence.invalidate_cache(['number_next'])
+            numbers = [start + i * increment for i in range(count)]
+
+        prefix, suffix = sequence._get_prefix_suffix()
+        number_format = '%%0%sd' % sequence.padding
+        return [
+            prefix + number_format % number + suffix
+            for number in numbers
+        ]
+
+    def _name_by_sequence_update_name_in_vals_list(self, vals_list):
+        """ Set names in list of values provided to 'create' method.
+            Sequence numbers for all records are reserved at once.
         """
         if not self._name_by_sequence_name_field:
-            return vals
+            return vals_list
 
         if self._name_by_sequence_name_field not in self._fields:
-            return vals
+            return vals_list
 
         if not self._name_by_sequence_sequence_code:
-            return vals
+            return vals_list
 
         fname = self._name_by_sequence_name_field
         fdefault = self._name_by_sequence_get_default_value()
-        fsequence = self._name_by_sequence_sequence_code
 
-        if vals.get(fname, fdefault) == fdefault:
-            vals = dict(vals)
-            vals[fname] = self.env['ir.sequence'].next_by_code(
-                fsequence) or fdefault
-        return vals
+        to_name = [
+            idx for idx, vals in enumerate(vals_list)
+            if vals.get(fname, fdefault) == fdefault
+        ]
+        if not to_name:
+            return vals_list
 
-    # TODO: add support for batch create
-    @api.model
-    def create(self, vals):
-        vals = self._name_by_sequence_update_name_in_vals(vals)
-        return super(GenericMixinNameBySequence, self).create(vals)
+        vals_list = list(vals_list)
+        names = self._name_by_sequence_reserve_names(len(to_name))
+        for idx, name in zip(to_name, names):
+            vals_list[idx] = dict(vals_list[idx], **{fname: name})
+        return vals_list
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        vals_list = self._name_by_sequence_update_name_in_vals_list(
+            vals_list)
+        return super(GenericMixinNameBySequence, self).create(vals_list)
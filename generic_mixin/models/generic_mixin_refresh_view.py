@@ -1,8 +1,23 @@
+import json
 import logging
+import threading
+import collections
+
 from odoo import models, api, tools
 
 _logger = logging.getLogger(__name__)
 
+REFRESH_VIEW_CHANNEL = 'generic_mixin_refresh_view'
+
+# Default min interval (in seconds) between refresh notifications for model
+DEFAULT_REFRESH_VIEW_MIN_INTERVAL = 1.0
+
+# Ids of records, notifications for which were delayed by rate limit:
+# (dbname, model) -> set(res_ids). These ids are sent together with next
+# notifications flushed by this worker.
+_refresh_lock = threading.Lock()
+_refresh_delayed = collections.defaultdict(set)
+
 
 class GenericMixinRefreshView(models.AbstractModel):
     """ This mixin could be used to send notifucation to view to refresh
@@ -11,11 +26,19 @@ class GenericMixinRefreshView(models.AbstractModel):
         By default, inheriting this mixin will cause automatic refresh of view
         on write. This bechavior could be disabled by setting class (model)
         attribute '_auto_refresh_view_on_write' to False
+
+        Notifications are collected during transaction and sent on commit
+        (in same transaction): one notification per model, that contains
+        ids of all changed records. Also, notifications for each model are
+        sent not more often than once per '_auto_refresh_view_min_interval'
+        seconds: ids of records changed more often are delayed until next
+        notification.
     """
     _name = 'generic.mixin.refresh.view'
     _description = 'Generic Mixin: Refresh view'
 
     _auto_refresh_view_on_write = True
+    _auto_refresh_view_min_interval = DEFAULT_REFRESH_VIEW_MIN_INTERVAL
 
     @api.model
     def _auto_refresh_view_on_field_changes(self):
@@ -46,6 +69,65 @@ class GenericMixinRefreshView(models.AbstractModel):
             ))
         return track_fields
 
+    @api.model
+    def _refresh_view_is_rate_limited(self, model, min_interval):
+        """ Check if refresh notification for model was sent less then
+            min_interval seconds ago. Bus messages are stored in database,
+            thus this check works across all workers.
+        """
+        if not min_interval:
+            return False
+        self.env.cr.execute("""
+            SELECT 1
+            FROM bus_bus
+            WHERE channel = %(channel)s
+              AND create_date > (now() AT TIME ZONE 'UTC') -
+                                %(min_interval)s * INTERVAL '1 second'
+              AND message::json->>'model' = %(model)s
+            LIMIT 1
+        """, {
+            'channel': json.dumps(REFRESH_VIEW_CHANNEL),
+            'min_interval': min_interval,
+            'model': model,
+        })
+        return bool(self.env.cr.fetchone())
+
+    @api.model
+    def _refresh_view_send_notifications(self, pending):
+        """ Send one bus message per model for refresh intents collected
+            during transaction. Bus delivers messages only after commit.
+            Ids of models that are rate limited now are delayed until
+            next call.
+
+            :param dict pending: {model: set(res_ids)}
+        """
+        dbname = self.env.cr.dbname
+        pending = collections.defaultdict(set, pending)
+        with _refresh_lock:
+            for key in [k for k in _refresh_delayed if k[0] == dbname]:
+                pending[key[1]] |= _refresh_delayed.pop(key)
+
+        notifications = []
+        for model, res_ids in pending.items():
+            if model not in self.env:
+                continue
+            min_interval = getattr(
+                self.env[model], '_auto_refresh_view_min_interval',
+                DEFAULT_REFRESH_VIEW_MIN_INTERVAL)
+            if self._refresh_view_is_rate_limited(model, min_interval):
+                _logger.debug(
+                    "Refresh view notification for %s delayed by "
+                    "rate limit", model)
+                with _refresh_lock:
+                    _refresh_delayed[(dbname, model)] |= res_ids
+                continue
+            notifications.append((REFRESH_VIEW_CHANNEL, {
+                'model': model,
+                'res_ids': sorted(res_ids),
+            }))
+        if notifications:
+            self.env['bus.bus'].sudo().sendmany(notifications)
+
     @api.model
     def trigger_refresh_view_for(self, records):
         """ Triggre refresh of views for arbitary recordset.
@@ -54,13 +136,22 @@ class GenericMixinRefreshView(models.AbstractModel):
         """
         if not records:
             return False
-        self.env['bus.bus'].sendone(
-            'generic_mixin_refresh_view',
-            {
-                'model': records._name,
-                'res_ids': list(records.ids),
-            },
-        )
+
+        # Collect ids to refresh in transaction, and send them on commit
+        cr = self.env.cr
+        pending = cr.precommit.data.get(REFRESH_VIEW_CHANNEL)
+        if pending is None:
+            pending = cr.precommit.data[REFRESH_VIEW_CHANNEL] = (
+                collections.defaultdict(set))
+            env = self.env
+
+            @cr.precommit.add
+            def send_notifications():
+                env[
+                    'generic.mixin.refresh.view'
+                ]._refresh_view_send_notifications(pending)
+
+        pending[records._name].update(records.ids)
         return True
 
     def trigger_refresh_view(self):
@@ -1,9 +1,25 @@
+import time
+import random
 import logging
+import threading
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg2
+from psycopg2 import errorcodes
+
 from odoo import models, api
+from odoo.tools import ustr, split_every
 
 _logger = logging.getLogger(__name__)
 
+# Errors, that could be fixed by retrying transaction
+RETRYABLE_PG_ERRORS = (
+    errorcodes.SERIALIZATION_FAILURE,
+    errorcodes.DEADLOCK_DETECTED,
+    errorcodes.LOCK_NOT_AVAILABLE,
+)
+
 
 class GenericMixinTransactionUtils(models.AbstractModel):
     """ Simple mixin that contains utility methods related to
@@ -20,6 +36,16 @@ class GenericMixinTransactionUtils(models.AbstractModel):
                     # do your long-runnning operation and be sure, that if
                     # record was precessed successufully changes will be
                     # commited.
+
+        Or process records by chunks, each chunk in separate transaction,
+        retrying chunks that failed because of lock or serialization errors,
+        optionally in parallel:
+
+            result = records._process_in_transactions(
+                lambda chunk: chunk.do_work(),
+                chunk_size=500, lock=True, workers=4)
+            for ids, error in result['errors']:
+                _logger.error("Cannot process %s: %s", ids, error)
     """
     _name = 'generic.mixin.transaction.utils'
     _description = 'GenericMixin: Transaction Utils'
@@ -94,3 +120,94 @@ class GenericMixinTransactionUtils(models.AbstractModel):
         for rec in self:
             with rec._in_new_transaction(lock=lock, no_raise=no_raise) as nrec:
                 yield nrec
+
+    def _iter_chunks_in_transact(self, chunk_size=100, lock=False,
+                                 no_raise=False):
+        """ Iterate over records in self by chunks, yield each chunk
+            wrapped in separate transaction
+
+            :param int chunk_size: number of records in single transaction
+            :param bool lock: lock records of chunk for update (nowait)
+            :param bool no_raise: Do not raise errors,
+                                  just roll back transaction instead
+
+            Example of usage:
+
+                for chunk in self._iter_chunks_in_transact(chunk_size=500):
+                    chunk.do_some_operation()
+        """
+        for chunk in split_every(chunk_size, self.ids, self.browse):
+            with chunk._in_new_transaction(
+                    lock=lock, no_raise=no_raise) as nchunk:
+                yield nchunk
+
+    def _run_in_transaction(self, func, lock=False, max_retries=3,
+                            retry_delay=0.5):
+        """ Call func(records) in new transaction. If transaction failed
+            because of serialization error, deadlock, or because records
+            could not be locked, then retry it with exponential backoff.
+
+            :param func: callable that receives records (in new env)
+            :param bool lock: lock records in self for update (nowait)
+            :param int max_retries: max number of retries
+            :param float retry_delay: delay (in seconds) before first retry
+            :return: result of func
+        """
+        attempt = 0
+        while True:
+            try:
+                with self._in_new_transaction(lock=lock) as nself:
+                    return func(nself)
+            except psycopg2.OperationalError as exc:
+                if (exc.pgcode not in RETRYABLE_PG_ERRORS or
+                        attempt >= max_retries):
+                    raise
+                delay = retry_delay * (2 ** attempt) * (1 + random.random())
+                attempt += 1
+                _logger.info(
+                    "Transaction for %s failed (%s). "
+                    "Retry %s of %s in %.2f seconds",
+                    self, exc.pgcode, attempt, max_retries, delay)
+                time.sleep(delay)
+
+    def _process_in_transactions(self, func, chunk_size=100, lock=False,
+                                 max_retries=3, retry_delay=0.5, workers=1):
+        """ Process records in self by chunks, calling func(chunk)
+            for each chunk in separate transaction (see _run_in_transaction).
+
+            Errors of single chunks do not stop processing of other chunks.
+
+            :param func: callable that receives chunk of records
+            :param int chunk_size: number of records in single transaction
+            :param bool lock: lock records of chunk for update (nowait)
+            :param int max_retries: max number of retries for each chunk
+            :param float retry_delay: delay (in seconds) before first retry
+            :param int workers: number of threads to process disjoint
+                                chunks in parallel. Ignored in test mode.
+            :return dict: {'done': number of processed records,
+                           'errors': list of tuples (ids, error message)}
+        """
+        def process_chunk(chunk):
+            try:
+                chunk._run_in_transaction(
+                    func, lock=lock,
+                    max_retries=max_retries, retry_delay=retry_delay)
+            except Exception as exc:  # pylint: disable=broad-except
+                _logger.warning(
+                    "Error caught while processing %s in transaction",
+                    chunk, exc_info=True)
+                return chunk.ids, ustr(exc)
+            return chunk.ids, None
+
+        chunks = list(split_every(chunk_size, self.ids, self.browse))
+        testing = getattr(threading.currentThread(), 'testing', False)
+        if workers > 1 and len(chunks) > 1 and not testing:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(process_chunk, chunks))
+        else:
+            results = [process_chunk(chunk) for chunk in chunks]
+
+        return {
+            'done': sum(len(ids) for ids, error in results if not error),
+            'errors': [(ids, error) for ids, error in results if error],
+        }
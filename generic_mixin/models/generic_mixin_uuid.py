@@ -1,5 +1,15 @@
 import uuid
-from odoo import models, fields, api
+import logging
+
+import psycopg2
+import psycopg2.errors
+
+from odoo import models, fields, api, tools
+
+_logger = logging.getLogger(__name__)
+
+# How many times to regenerate UUIDs in case of (very unlikely) conflict
+UUID_CREATE_MAX_RETRIES = 3
 
 
 class GenericMixinUUID(models.AbstractModel):
@@ -19,6 +29,10 @@ class GenericMixinUUID(models.AbstractModel):
 
         After this, your model will automaticall have field 'uuid' that will
         be unique and automatically generated on creation of model.
+        Uniqueness is guaranteed by unique index in database. Create is
+        done in savepoint (without flush of environment), and in case of
+        (very unlikely) conflict on this index, UUIDs are regenerated and
+        create is retried.
 
         If you add this field to existing model, then you have also provide
         migration to automatically generate new UUIDs for existing records.
@@ -64,18 +78,89 @@ class GenericMixinUUID(models.AbstractModel):
             )
         return res
 
+    def _generic_mixin_uuid__get_index_name(self):
+        return '%s_%s_uniq_index' % (
+            self._table, self._generic_mixin_uuid_field_name)
+
+    def init(self):
+        res = super(GenericMixinUUID, self).init()
+        if self._abstract:
+            return res
+
+        field = self._fields.get(self._generic_mixin_uuid_field_name)
+        if not field or not field.store:
+            return res
+
+        index_name = self._generic_mixin_uuid__get_index_name()
+        if tools.index_exists(self.env.cr, index_name):
+            return res
+
+        # Records that have no UUID generated yet have '/' as value
+        try:
+            with self.env.cr.savepoint():
+                self.env.cr.execute(
+                    # pylint: disable=sql-injection
+                    'CREATE UNIQUE INDEX "%(index)s" '
+                    'ON "%(table)s" ("%(field)s") '
+                    'WHERE "%(field)s" != \'/\'' % {  # nosec
+                        'index': index_name,
+                        'table': self._table,
+                        'field': self._generic_mixin_uuid_field_name,
+                    })
+        except psycopg2.IntegrityError:
+            _logger.warning(
+                "Cannot create unique index on %s.%s: "
+                "there are duplicate UUIDs",
+                self._table, self._generic_mixin_uuid_field_name)
+        return res
+
     @api.model
     def _generic_mixin_uuid__generate_new(self):
-        """ Generate new UUID that is not used in this model yet
+        """ Generate new UUID.
+
+            Uniqueness is checked by unique index on database level.
         """
-        _uuid = str(uuid.uuid4())
-        while self.with_context(active_test=False).search_count(
-                [(self._generic_mixin_uuid_field_name, '=', _uuid)]) > 0:
-            _uuid = str(uuid.uuid4())
-        return _uuid
+        return str(uuid.uuid4())
 
     @api.model
-    def create(self, vals):
-        vals[self._generic_mixin_uuid_field_name] = (
-            self._generic_mixin_uuid__generate_new())
-        return super(GenericMixinUUID, self).create(vals)
+    def _generic_mixin_uuid__generate_new_list(self, count):
+        """ Generate 'count' new UUIDs, unique inside list.
+            Uniqueness in database is checked by unique index on create.
+        """
+        while True:
+            uuids = [
+                self._generic_mixin_uuid__generate_new()
+                for __ in range(count)
+            ]
+            if len(set(uuids)) == len(uuids):
+                return uuids
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        field = self._fields.get(self._generic_mixin_uuid_field_name)
+        if not vals_list or not field or not field.store:
+            return super(GenericMixinUUID, self).create(vals_list)
+
+        index_name = self._generic_mixin_uuid__get_index_name()
+        attempt = 0
+        while True:
+            uuids = self._generic_mixin_uuid__generate_new_list(
+                len(vals_list))
+            try:
+                with self.env.cr.savepoint(flush=False):
+                    return super(GenericMixinUUID, self).create([
+                        dict(vals, **{
+                            self._generic_mixin_uuid_field_name: uuid_value,
+                        })
+                        for vals, uuid_value in zip(vals_list, uuids)
+                    ])
+            except psycopg2.errors.UniqueViolation as exc:
+                if (exc.diag.constraint_name != index_name or
+                        attempt >= UUID_CREATE_MAX_RETRIES):
+                    raise
+                # Records inserted before conflict are rolled back
+                self.invalidate_cache()
+                attempt += 1
+                _logger.info(
+                    "UUID conflict on create of %s. Retry %s of %s.",
+                    self._name, attempt, UUID_CREATE_MAX_RETRIES)
@@ -1,7 +1,13 @@
-from odoo import api, models, _
+import logging
+
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import ValidationError
 from odoo.osv import expression
 
+_logger = logging.getLogger(__name__)
+
+COMPLETE_NAME_SEPARATOR = ' / '
+
 
 # Inspired by default product.category implementation
 class GenericMixinParentNames(models.AbstractModel):
@@ -15,6 +21,12 @@ class GenericMixinParentNames(models.AbstractModel):
         Do not forget to specifu model attribute `_parent_name`
         which tells this mixin what field is used for parent / child relation
 
+        Mixin stores materialized path of ids ('parent_path', maintained by
+        Odoo's parent store) and complete name of each record
+        ('complete_name', maintained by single recursive SQL UPDATE per
+        changed subtree). These fields are used by name_get and
+        name_search to avoid walking parents in Python.
+
         Example:
 
             class MyCoolModel(models.Model):
@@ -26,6 +38,10 @@ class GenericMixinParentNames(models.AbstractModel):
     """
     _name = "generic.mixin.parent.names"
     _description = "Generic Mixin: Parent Names"
+    _parent_store = True
+
+    parent_path = fields.Char(index=True)
+    complete_name = fields.Char(index=True, readonly=True, copy=False)
 
     # Overridden to add recursion check constraint
     @classmethod
@@ -45,6 +61,120 @@ class GenericMixinParentNames(models.AbstractModel):
 
         return super(GenericMixinParentNames, cls)._build_model(pool, cr)
 
+    def init(self):
+        res = super(GenericMixinParentNames, self).init()
+        if self._abstract:
+            return res
+
+        # Fill complete names for records created before this field added
+        self.env.cr.execute(
+            # pylint: disable=sql-injection
+            'SELECT 1 FROM "%s" WHERE complete_name IS NULL '
+            'LIMIT 1' % self._table)  # nosec
+        if self.env.cr.fetchone():
+            self._parent_names_update_complete_name()
+
+        # Trigram indexes used by name_search (complete name for path-like
+        # names, name itself for simple ones), if pg_trgm is available
+        self.env.cr.execute(
+            "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if not self.env.cr.fetchone():
+            _logger.info(
+                "Extension pg_trgm is not installed, so trigram indexes "
+                "on %s are not created", self._table)
+            return res
+
+        columns = ['complete_name']
+        name_field = self._fields[self._rec_name_fallback()]
+        if name_field.type == 'char' and name_field.store:
+            columns.append(name_field.name)
+        for column in columns:
+            index_name = '%s_%s_trgm_index' % (self._table, column)
+            if not tools.index_exists(self.env.cr, index_name):
+                self.env.cr.execute(
+                    # pylint: disable=sql-injection
+                    'CREATE INDEX "%s" ON "%s" '
+                    'USING gin ("%s" gin_trgm_ops)' % (  # nosec
+                        index_name, self._table, column))
+        return res
+
+    def _parent_names_update_complete_name(self):
+        """ Update complete names for records in self and all their
+            descendants with single recursive SQL query.
+            If self is empty, then complete names of all records are updated.
+        """
+        name_column = self._rec_name_fallback()
+        query = """
+            WITH RECURSIVE tree (id, complete_name, depth) AS (
+                -- concat_ws skips NULLs, thus records without name are
+                -- skipped in complete names of descendants (as in name_get)
+                SELECT r.id,
+                       NULLIF(concat_ws(%(sep)s, p.complete_name,
+                                        NULLIF(r."{name}", '')), ''),
+                       0
+                FROM "{table}" AS r
+                LEFT JOIN "{table}" AS p ON p.id = r."{parent}"
+                WHERE {where}
+
+                UNION ALL
+
+                SELECT c.id,
+                       NULLIF(concat_ws(%(sep)s, tree.complete_name,
+                                        NULLIF(c."{name}", '')), ''),
+                       tree.depth + 1
+                FROM "{table}" AS c
+                JOIN tree ON c."{parent}" = tree.id
+            )
+            UPDATE "{table}" AS t
+            SET complete_name = u.complete_name
+            FROM (
+                -- If both record and its ancestor are in self, then take
+                -- value computed from ancestor (the deepest one)
+                SELECT DISTINCT ON (id) id, complete_name
+                FROM tree
+                ORDER BY id, depth DESC
+            ) AS u
+            WHERE t.id = u.id
+              AND t.complete_name IS DISTINCT FROM u.complete_name
+        """.format(
+            table=self._table,
+            name=name_column,
+            parent=self._parent_name,
+            where=('r.id IN %(ids)s' if self
+                   else 'r."%s" IS NULL' % self._parent_name),
+        )
+        self.flush([name_column, self._parent_name])
+        # pylint: disable=sql-injection
+        self.env.cr.execute(query, {
+            'sep': COMPLETE_NAME_SEPARATOR,
+            'ids': tuple(self.ids),
+        })
+        self.invalidate_cache(['complete_name'])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super(GenericMixinParentNames, self).create(vals_list)
+        if records:
+            records._parent_names_update_complete_name()
+        return records
+
+    def write(self, vals):
+        res = super(GenericMixinParentNames, self).write(vals)
+        if self and (self._rec_name_fallback() in vals or
+                     self._parent_name in vals):
+            self._parent_names_update_complete_name()
+        return res
+
+    def _parent_names_use_complete_name(self):
+        """ Stored complete name contains untranslated names, thus it could
+            be used only if name is not translatable or if
+            current language is english.
+        """
+        name_field = self._fields[self._rec_name_fallback()]
+        return (
+            not name_field.translate or
+            (self.env.lang or 'en_US') == 'en_US')
+
     def name_get(self):
         if self.env.context.get('_use_standart_name_get_', False):
             return super(GenericMixinParentNames, self).name_get()
@@ -59,14 +189,41 @@ class GenericMixinParentNames(models.AbstractModel):
                 rec = rec[self._parent_name]
             return res
 
-        return [(rec.id, " / ".join(reversed(get_names(rec.sudo()))))
-                for rec in self]
+        def get_complete_name(rec):
+            return " / ".join(reversed(get_names(rec)))
+
+        if self._parent_names_use_complete_name():
+            # New records (for example in onchange) have no stored
+            # complete name yet (NewId is falsy), thus compute it from names
+            return [(rec.id,
+                     (rec.id and rec.complete_name) or get_complete_name(rec))
+                    for rec in self.sudo()]
+
+        return [(rec.id, get_complete_name(rec.sudo())) for rec in self]
 
     @api.model
     def name_search(self, name, args=None, operator='ilike', limit=100):
         if not args:
             args = []
-        if name:
+        if name and self._parent_names_use_complete_name():
+            # Path-like names are searched by stored complete name,
+            # simple names - by name itself (both with trigram index)
+            if COMPLETE_NAME_SEPARATOR not in name:
+                domain = [(self._rec_name_fallback(), operator, name)]
+            elif operator in ('ilike', 'like'):
+                # Match complete name by prefix, but do not match
+                # descendants of records matched by prefix
+                prefix = name.replace('\\', '\\\\').replace(
+                    '%', '\\%').replace('_', '\\_')
+                domain = [
+                    ('complete_name', '=' + operator, prefix + '%'),
+                    '!', ('complete_name', '=' + operator,
+                          prefix + '%' + COMPLETE_NAME_SEPARATOR + '%'),
+                ]
+            else:
+                domain = [('complete_name', operator, name)]
+            records = self.search(expression.AND([domain, args]), limit=limit)
+        elif name:
             # Be sure name_search is symetric to name_get
             record_names = name.split(' / ')
             parents = list(record_names)
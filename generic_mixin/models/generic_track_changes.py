@@ -4,6 +4,7 @@ from operator import itemgetter
 from inspect import getmembers
 from odoo import models, api
 from odoo.fields import resolve_mro
+from ..tools import handler_stats
 
 _logger = logging.getLogger(__name__)
 
@@ -264,9 +265,11 @@ class GenericMixInTrackChanges(models.AbstractModel):
         """
         self.ensure_one()
         res = {}
+        track = handler_stats.is_enabled(self.env)
         for handler in self._write_handler_data['pre_write_handlers']:
             if set(handler['fields']) & set(changes):
-                handler_res = getattr(self, handler['method'])(changes)
+                handler_res = self._call_write_handler(
+                    handler['method'], changes, track=track)
                 if handler_res and isinstance(handler_res, dict):
                     res.update(handler_res)
         return res
@@ -283,11 +286,21 @@ class GenericMixInTrackChanges(models.AbstractModel):
             :return: None
 
         """
+        track = handler_stats.is_enabled(self.env)
         for handler in self._write_handler_data['post_write_handlers']:
             if set(handler['fields']) & set(changes):
-                getattr(self, handler['method'])(changes)
+                self._call_write_handler(
+                    handler['method'], changes, track=track)
         self.ensure_one()
 
+    def _call_write_handler(self, method, changes, track=False):
+        """ Call write handler, recording its timing if track is set.
+        """
+        if not track:
+            return getattr(self, method)(changes)
+        with handler_stats.track_handler(self.env, self._name, method):
+            return getattr(self, method)(changes)
+
     def write(self, vals):
         changes = self._get_changed_fields(vals)
 
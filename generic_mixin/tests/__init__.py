@@ -0,0 +1,8 @@
+from . import (
+    test_generic_mixin_uuid,
+    test_generic_mixin_name_by_sequence,
+    test_generic_mixin_refresh_view,
+    test_generic_mixin_transaction_utils,
+    test_jinja,
+    test_generic_mixin_get_action,
+)
@@ -3,6 +3,13 @@ from odoo.tools.misc import mute_logger
 from odoo.tools import config as tools_config
 from odoo.tests import common as tests_common
 
+try:
+    from odoo_test_helper import FakeModelLoader
+except ImportError:  # pragma: no cover
+    FakeModelLoader = None
+    logging.getLogger(__name__).warning(
+        "odoo_test_helper not installed. Tests will not work!")
+
 
 # For compatability with 14.0
 PORT = tools_config['http_port']
@@ -115,3 +122,31 @@ class AccessRulesFixMixinMT:
             ('module', 'not in', tuple(self.env.registry._init_modules)),
         ]).mapped('res_id')
         self.env['ir.rule'].browse(rule_ids).write({'active': False})
+
+
+class FakeModelsMixin:
+    """ Register test models (defined in generic_mixin/tests/fake_models.py)
+        for single transaction cases (SavepointCase).
+
+        Set '_fake_models' to list of names of classes to be loaded:
+
+            class MyTest(FakeModelsMixin, SavepointCase):
+                _fake_models = ['GenericMixinTestUUID']
+    """
+    _fake_models = ()
+
+    @classmethod
+    def setUpClass(cls):
+        super(FakeModelsMixin, cls).setUpClass()
+        cls.loader = FakeModelLoader(cls.env, cls.__module__)
+        cls.loader.backup_registry()
+
+        # Fake models have to be imported only after registry backup
+        from . import fake_models
+        cls.loader.update_registry([
+            getattr(fake_models, name) for name in cls._fake_models])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loader.restore_registry()
+        super(FakeModelsMixin, cls).tearDownClass()
@@ -0,0 +1,46 @@
+""" Models used only in tests of generic_mixin.
+
+    This module must not be imported directly, use
+    'common.FakeModelsMixin' to register these models in tests.
+"""
+from odoo import models, fields
+
+
+class GenericMixinTestPlain(models.Model):
+    _name = 'generic.mixin.test.plain'
+    _description = 'Generic Mixin Test: Plain'
+
+    name = fields.Char()
+
+
+class GenericMixinTestUUID(models.Model):
+    _name = 'generic.mixin.test.uuid'
+    _inherit = 'generic.mixin.uuid'
+    _description = 'Generic Mixin Test: UUID'
+    _generic_mixin_uuid_auto_add_field = True
+
+    name = fields.Char()
+
+
+class GenericMixinTestNameBySequence(models.Model):
+    _name = 'generic.mixin.test.name.by.sequence'
+    _inherit = 'generic.mixin.name.by.sequence'
+    _description = 'Generic Mixin Test: Name by Sequence'
+    _name_by_sequence_auto_add_field = True
+    _name_by_sequence_sequence_code = 'generic.mixin.test.name.by.sequence'
+
+
+class GenericMixinTestRefreshView(models.Model):
+    _name = 'generic.mixin.test.refresh.view'
+    _inherit = 'generic.mixin.refresh.view'
+    _description = 'Generic Mixin Test: Refresh View'
+
+    name = fields.Char()
+
+
+class GenericMixinTestTransactionUtils(models.Model):
+    _name = 'generic.mixin.test.transaction.utils'
+    _inherit = 'generic.mixin.transaction.utils'
+    _description = 'Generic Mixin Test: Transaction Utils'
+
+    name = fields.Char()
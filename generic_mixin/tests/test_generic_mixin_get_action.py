@@ -0,0 +1,66 @@
+from odoo.tests.common import SavepointCase
+
+ACTION_XMLID = 'base.action_res_users'
+
+
+class TestGenericMixinGetAction(SavepointCase):
+
+    def _get_action(self, user=None, **kwargs):
+        GetAction = self.env['generic.mixin.get.action']
+        if user is not None:
+            GetAction = GetAction.with_user(user)
+        return GetAction.get_action_by_xmlid(ACTION_XMLID, **kwargs)
+
+    def test_get_action_cached(self):
+        GetAction = self.env['generic.mixin.get.action']
+        self.assertIs(
+            GetAction._get_action_by_xmlid_cached(ACTION_XMLID),
+            GetAction._get_action_by_xmlid_cached(ACTION_XMLID))
+
+        expected = self.env['ir.actions.actions']._for_xml_id(ACTION_XMLID)
+        self.assertEqual(self._get_action(), expected)
+
+    def test_get_action_deep_copy(self):
+        action = self._get_action()
+        original_views = list(action['views'])
+        self.assertIsNot(action, self._get_action())
+        self.assertIsNot(action['views'], self._get_action()['views'])
+
+        # Changes of result must not affect next callers
+        action['views'].append((False, 'kanban'))
+        action['name'] = 'Changed'
+        action['res_model'] = 'res.partner'
+        action = self._get_action()
+        self.assertEqual(action['views'], original_views)
+        self.assertNotEqual(action['name'], 'Changed')
+        self.assertEqual(action['res_model'], 'res.users')
+
+        # Context and domain are applied only to current result
+        action = self._get_action(
+            context={'test_key': 1}, domain=[('id', '=', 1)])
+        self.assertEqual(action['context'], {'test_key': 1})
+        self.assertEqual(action['domain'], [('id', '=', 1)])
+        action = self._get_action()
+        self.assertNotEqual(action['context'], {'test_key': 1})
+        self.assertNotEqual(action['domain'], [('id', '=', 1)])
+
+    def test_get_action_group_sets(self):
+        demo_user = self.env.ref('base.user_demo')
+        self.assertNotEqual(
+            demo_user.groups_id, self.env.user.groups_id)
+
+        admin_action = self._get_action()
+        admin_action_copy = dict(admin_action, views=list(
+            admin_action['views']))
+        demo_action = self._get_action(user=demo_user)
+        self.assertEqual(
+            demo_action,
+            self.env['ir.actions.actions'].with_user(
+                demo_user)._for_xml_id(ACTION_XMLID))
+
+        # Result for one group set is not changed by callers of other
+        demo_action['views'].append((False, 'kanban'))
+        demo_action['name'] = 'Changed'
+        self.assertEqual(self._get_action(), admin_action_copy)
+        self.assertNotEqual(
+            self._get_action(user=demo_user)['name'], 'Changed')
@@ -0,0 +1,80 @@
+from odoo.tests.common import SavepointCase
+
+from .common import FakeModelsMixin
+
+SEQUENCE_CODE = 'generic.mixin.test.name.by.sequence'
+
+
+class TestGenericMixinNameBySequence(FakeModelsMixin, SavepointCase):
+    _fake_models = ['GenericMixinTestNameBySequence']
+
+    def _create_sequence(self, **kwargs):
+        vals = {
+            'name': 'Test Name By Sequence',
+            'code': SEQUENCE_CODE,
+            'company_id': False,
+            'prefix': 'TST/',
+            'suffix': '/X',
+            'padding': 4,
+            'number_next': 5,
+            'number_increment': 1,
+        }
+        vals.update(kwargs)
+        return self.env['ir.sequence'].create(vals)
+
+    def _count_queries(self, func):
+        start = self.env.cr.sql_log_count
+        func()
+        return self.env.cr.sql_log_count - start
+
+    def test_batch_create_standard_sequence(self):
+        self._create_sequence(implementation='standard')
+        records = self.env['generic.mixin.test.name.by.sequence'].create(
+            [{} for __ in range(3)])
+        self.assertEqual(
+            records.mapped('name'),
+            ['TST/0005/X', 'TST/0006/X', 'TST/0007/X'])
+
+        record = self.env['generic.mixin.test.name.by.sequence'].create({})
+        self.assertEqual(record.name, 'TST/0008/X')
+
+    def test_batch_create_no_gap_sequence(self):
+        sequence = self._create_sequence(
+            implementation='no_gap', prefix='NG-', suffix='',
+            padding=6, number_increment=2)
+        records = self.env['generic.mixin.test.name.by.sequence'].create(
+            [{} for __ in range(3)])
+        self.assertEqual(
+            records.mapped('name'),
+            ['NG-000005', 'NG-000007', 'NG-000009'])
+        self.assertEqual(sequence.number_next, 11)
+
+        # Names generated via standard sequence API continue numbering
+        self.assertEqual(sequence.next_by_id(), 'NG-000011')
+
+    def test_batch_create_explicit_names(self):
+        self._create_sequence(implementation='no_gap')
+        records = self.env['generic.mixin.test.name.by.sequence'].create([
+            {},
+            {'name': 'Explicit name'},
+            {'name': 'New'},
+            {},
+        ])
+        self.assertEqual(
+            records.mapped('name'),
+            ['TST/0005/X', 'Explicit name', 'TST/0006/X', 'TST/0007/X'])
+
+    def test_batch_create_no_sequence(self):
+        records = self.env['generic.mixin.test.name.by.sequence'].create(
+            [{} for __ in range(2)])
+        self.assertEqual(records.mapped('name'), ['New', 'New'])
+
+    def test_reserve_names_single_round_trip(self):
+        self._create_sequence(implementation='standard')
+        Model = self.env['generic.mixin.test.name.by.sequence']
+        Model._name_by_sequence_reserve_names(1)
+        few = self._count_queries(
+            lambda: Model._name_by_sequence_reserve_names(2))
+        many = self._count_queries(
+            lambda: Model._name_by_sequence_reserve_names(200))
+        self.assertEqual(few, many)
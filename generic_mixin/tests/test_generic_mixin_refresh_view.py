@@ -0,0 +1,86 @@
+import json
+
+from odoo.tests.common import SavepointCase
+
+from ..models import generic_mixin_refresh_view
+from .common import FakeModelsMixin
+
+MODEL = 'generic.mixin.test.refresh.view'
+CHANNEL = generic_mixin_refresh_view.REFRESH_VIEW_CHANNEL
+
+
+class TestGenericMixinRefreshView(FakeModelsMixin, SavepointCase):
+    _fake_models = ['GenericMixinTestRefreshView']
+
+    def setUp(self):
+        super(TestGenericMixinRefreshView, self).setUp()
+        generic_mixin_refresh_view._refresh_delayed.clear()
+        self.addCleanup(generic_mixin_refresh_view._refresh_delayed.clear)
+        # Callbacks are not cleared on rollback to savepoint between tests
+        self.env.cr.precommit.clear()
+        self.env['bus.bus'].sudo().search(
+            [('channel', '=', json.dumps(CHANNEL))]).unlink()
+
+    def _get_sent_messages(self):
+        return [
+            json.loads(m.message)
+            for m in self.env['bus.bus'].sudo().search(
+                [('channel', '=', json.dumps(CHANNEL))], order='id')
+        ]
+
+    def _flush(self):
+        """ Run callbacks that are run on commit of transaction
+        """
+        self.env.cr.precommit.run()
+
+    def _expire_sent_messages(self):
+        self.env.cr.execute("""
+            UPDATE bus_bus
+            SET create_date = create_date - INTERVAL '1 hour'
+            WHERE channel = %s
+        """, (json.dumps(CHANNEL),))
+
+    def test_refresh_view_coalesced(self):
+        records = self.env[MODEL].create([
+            {'name': 'Test 1'}, {'name': 'Test 2'}])
+        for record in records:
+            record.name = 'Changed'
+        records.write({'name': 'Changed again'})
+
+        # Nothing is sent before commit
+        self.assertFalse(self._get_sent_messages())
+        self.assertEqual(
+            dict(self.env.cr.precommit.data[CHANNEL]),
+            {MODEL: set(records.ids)})
+
+        self._flush()
+        self.assertEqual(
+            self._get_sent_messages(),
+            [{'model': MODEL, 'res_ids': sorted(records.ids)}])
+
+    def test_refresh_view_rate_limit(self):
+        record_1, record_2 = self.env[MODEL].create([
+            {'name': 'Test 1'}, {'name': 'Test 2'}])
+        record_1.name = 'Changed'
+        self._flush()
+        self.assertEqual(len(self._get_sent_messages()), 1)
+
+        # Next notification within interval is delayed, not dropped
+        record_2.name = 'Changed'
+        self._flush()
+        self.assertEqual(len(self._get_sent_messages()), 1)
+        self.assertEqual(
+            generic_mixin_refresh_view._refresh_delayed[
+                (self.env.cr.dbname, MODEL)],
+            {record_2.id})
+
+        # Delayed ids are sent with next notification, when interval passed
+        self._expire_sent_messages()
+        record_1.name = 'Changed again'
+        self._flush()
+        messages = self._get_sent_messages()
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(
+            messages[-1],
+            {'model': MODEL, 'res_ids': sorted((record_1 | record_2).ids)})
+        self.assertFalse(generic_mixin_refresh_view._refresh_delayed)
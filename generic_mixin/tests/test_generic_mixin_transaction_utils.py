@@ -0,0 +1,124 @@
+from unittest import mock
+
+import psycopg2
+from psycopg2 import errorcodes
+
+from odoo.sql_db import TestCursor
+from odoo.tests.common import SavepointCase
+
+from ..models import generic_mixin_transaction_utils
+from .common import FakeModelsMixin
+
+MODEL = 'generic.mixin.test.transaction.utils'
+
+
+class PgTestError(psycopg2.OperationalError):
+    """ OperationalError with specified error code
+    """
+    def __init__(self, pgcode):
+        super(PgTestError, self).__init__("Test error %s" % pgcode)
+        self._test_pgcode = pgcode
+
+    @property
+    def pgcode(self):
+        return self._test_pgcode
+
+
+class TestGenericMixinTransactionUtils(FakeModelsMixin, SavepointCase):
+    _fake_models = ['GenericMixinTestTransactionUtils']
+
+    def setUp(self):
+        super(TestGenericMixinTransactionUtils, self).setUp()
+        # New cursors have to work inside test transaction
+        self.registry.enter_test_mode(self.env.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+
+        patcher = mock.patch.object(
+            generic_mixin_transaction_utils.time, 'sleep')
+        self.sleep_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.records = self.env[MODEL].create([
+            {'name': 'Test %s' % i} for i in range(5)])
+
+    def _make_failing_func(self, pgcode, failures):
+        calls = []
+
+        def func(records):
+            calls.append(records.env.cr)
+            if len(calls) <= failures:
+                raise PgTestError(pgcode)
+            return 'ok'
+        return func, calls
+
+    def test_retry_with_backoff(self):
+        for pgcode in (errorcodes.SERIALIZATION_FAILURE,
+                       errorcodes.DEADLOCK_DETECTED,
+                       errorcodes.LOCK_NOT_AVAILABLE):
+            self.sleep_mock.reset_mock()
+            func, calls = self._make_failing_func(pgcode, 2)
+            result = self.records._run_in_transaction(
+                func, max_retries=3, retry_delay=0.5)
+            self.assertEqual(result, 'ok')
+            self.assertEqual(len(calls), 3)
+            self.assertNotIn(self.env.cr, calls)
+
+            # Exponential backoff
+            self.assertEqual(self.sleep_mock.call_count, 2)
+            delays = [c[0][0] for c in self.sleep_mock.call_args_list]
+            self.assertTrue(0.5 <= delays[0] < 1.0)
+            self.assertTrue(1.0 <= delays[1] < 2.0)
+
+    def test_retry_exhausted(self):
+        func, calls = self._make_failing_func(
+            errorcodes.DEADLOCK_DETECTED, 10)
+        with self.assertRaises(psycopg2.OperationalError):
+            self.records._run_in_transaction(func, max_retries=2)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.sleep_mock.call_count, 2)
+
+    def test_no_retry_on_other_errors(self):
+        func, calls = self._make_failing_func(
+            errorcodes.QUERY_CANCELED, 10)
+        with self.assertRaises(psycopg2.OperationalError):
+            self.records._run_in_transaction(func, max_retries=2)
+        self.assertEqual(len(calls), 1)
+        self.sleep_mock.assert_not_called()
+
+    def test_iter_chunks_commit(self):
+        with mock.patch.object(
+                TestCursor, 'commit', autospec=True,
+                side_effect=TestCursor.commit) as commit_mock:
+            chunks = []
+            for chunk in self.records._iter_chunks_in_transact(chunk_size=2):
+                self.assertNotEqual(chunk.env.cr, self.env.cr)
+                chunk.write({'name': 'Processed'})
+                chunks.append(chunk.ids)
+        self.assertEqual(
+            chunks,
+            [self.records.ids[:2], self.records.ids[2:4],
+             self.records.ids[4:]])
+        self.assertEqual(commit_mock.call_count, 3)
+
+        self.records.invalidate_cache()
+        self.assertEqual(set(self.records.mapped('name')), {'Processed'})
+
+    def test_process_in_transactions_errors(self):
+        bad_record = self.records[2]
+
+        def func(chunk):
+            if bad_record.id in chunk.ids:
+                raise ValueError("Bad record")
+            chunk.write({'name': 'Processed'})
+
+        result = self.records._process_in_transactions(
+            func, chunk_size=2, workers=4)
+        self.assertEqual(result['done'], 3)
+        self.assertEqual(len(result['errors']), 1)
+        self.assertEqual(result['errors'][0][0], self.records.ids[2:4])
+        self.assertIn("Bad record", result['errors'][0][1])
+
+        self.records.invalidate_cache()
+        self.assertEqual(
+            self.records.mapped('name'),
+            ['Processed', 'Processed', 'Test 2', 'Test 3', 'Processed'])
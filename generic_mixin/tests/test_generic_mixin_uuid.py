@@ -0,0 +1,49 @@
+from odoo.tests.common import SavepointCase
+
+from .common import FakeModelsMixin
+
+
+class TestGenericMixinUUID(FakeModelsMixin, SavepointCase):
+    _fake_models = ['GenericMixinTestPlain', 'GenericMixinTestUUID']
+
+    def _count_queries(self, func):
+        start = self.env.cr.sql_log_count
+        func()
+        return self.env.cr.sql_log_count - start
+
+    def test_uuid_unique(self):
+        Model = self.env['generic.mixin.test.uuid']
+        records = Model.create([{'name': 'Test %s' % i} for i in range(10)])
+        uuids = records.mapped('uuid')
+        self.assertEqual(len(set(uuids)), 10)
+        self.assertNotIn('/', uuids)
+
+        # UUIDs passed to create are replaced with generated ones
+        record = Model.create({'name': 'Test', 'uuid': uuids[0]})
+        self.assertNotEqual(record.uuid, uuids[0])
+
+    def test_uuid_regenerate_on_conflict(self):
+        Model = self.env['generic.mixin.test.uuid']
+        existing = Model.create({'name': 'Existing'})
+
+        generated = iter([existing.uuid, 'new-test-uuid'])
+        Model._patch_method(
+            '_generic_mixin_uuid__generate_new',
+            lambda self: next(generated))
+        try:
+            record = Model.create({'name': 'Test'})
+        finally:
+            Model._revert_method('_generic_mixin_uuid__generate_new')
+        self.assertEqual(record.uuid, 'new-test-uuid')
+
+    def test_uuid_bulk_create_query_budget(self):
+        # Mixin have to add only savepoint around batch create (two
+        # queries), regardless of number of records created
+        count = 1000
+        queries_plain = self._count_queries(
+            lambda: self.env['generic.mixin.test.plain'].create([
+                {'name': 'Test %s' % i} for i in range(count)]))
+        queries_uuid = self._count_queries(
+            lambda: self.env['generic.mixin.test.uuid'].create([
+                {'name': 'Test %s' % i} for i in range(count)]))
+        self.assertLessEqual(queries_uuid - queries_plain, 2)
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from odoo.tests.common import BaseCase
+from odoo.tools.lru import LRU
+
+from ..tools import jinja
+from ..tools.jinja import render_jinja_string
+
+
+class TestJinja(BaseCase):
+
+    def test_template_cache_hit(self):
+        template_str = 'Hello {{ name }}! (cache hit test)'
+        env = jinja.get_default_jinja_template_env()
+        with mock.patch.object(
+                env, 'from_string', wraps=env.from_string) as compile_mock:
+            self.assertEqual(
+                render_jinja_string(template_str, {'name': 'John'}),
+                'Hello John! (cache hit test)')
+            self.assertEqual(
+                render_jinja_string(template_str, {'name': 'Jane'}),
+                'Hello Jane! (cache hit test)')
+        # Second rendering uses compiled template from cache
+        self.assertLessEqual(compile_mock.call_count, 1)
+        self.assertIn(template_str, jinja._template_cache)
+
+    def test_template_cache_eviction(self):
+        env = jinja.get_default_jinja_template_env()
+        with mock.patch.object(jinja, '_template_cache', LRU(2)), \
+                mock.patch.object(
+                    env, 'from_string',
+                    wraps=env.from_string) as compile_mock:
+            templates = ['Template %s: {{ value }}' % i for i in range(3)]
+            for template_str in templates:
+                render_jinja_string(template_str, {'value': 1})
+            self.assertEqual(compile_mock.call_count, 3)
+
+            # First template is evicted, but still rendered correctly
+            self.assertNotIn(templates[0], jinja._template_cache)
+            self.assertEqual(
+                render_jinja_string(templates[0], {'value': 42}),
+                'Template 0: 42')
+            self.assertEqual(compile_mock.call_count, 4)
+            self.assertIn(templates[0], jinja._template_cache)
+
+    def test_custom_env_not_cached(self):
+        template_str = 'Custom env: {{ value }}'
+        env = jinja.prepare_jinja_template_env()
+        self.assertEqual(
+            render_jinja_string(template_str, {'value': 1}, env=env),
+            'Custom env: 1')
+        self.assertNotIn(template_str, jinja._template_cache)
@@ -0,0 +1,89 @@
+""" Opt-in timing instrumentation for write and event handlers.
+
+    When enabled (via system parameter 'generic_mixin.handler_stats'),
+    each call of instrumented handler is recorded to in-memory ring buffer
+    of current worker. Each record contains model name, handler name,
+    duration (in seconds) and number of SQL queries made by handler.
+
+    Note, that stats are stored per worker process, thus, in multi-worker
+    setup, each worker will have its own stats.
+"""
+import time
+import threading
+import collections
+import contextlib
+
+HANDLER_STATS_PARAM = 'generic_mixin.handler_stats'
+HANDLER_STATS_BUFFER_SIZE = 10000
+
+HandlerCall = collections.namedtuple(
+    'HandlerCall', ['model', 'handler', 'duration', 'query_count'])
+
+_buffer = collections.deque(maxlen=HANDLER_STATS_BUFFER_SIZE)
+_buffer_lock = threading.Lock()
+
+
+def is_enabled(env):
+    """ Check if handler stats are enabled.
+
+        Value of system parameter is cached by ir.config_parameter,
+        thus this check does not produce SQL queries.
+    """
+    return env['ir.config_parameter'].sudo().get_param(
+        HANDLER_STATS_PARAM, 'False').lower() in ('1', 'true')
+
+
+@contextlib.contextmanager
+def track_handler(env, model, handler):
+    """ Record duration and number of SQL queries of code in block.
+
+        Usage:
+
+            with track_handler(self.env, self._name, 'my_handler'):
+                self.my_handler()
+    """
+    query_count = getattr(env.cr, 'sql_log_count', 0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        call = HandlerCall(
+            model, handler,
+            time.perf_counter() - start,
+            getattr(env.cr, 'sql_log_count', 0) - query_count)
+        with _buffer_lock:
+            _buffer.append(call)
+
+
+def get_stats():
+    """ Aggregate calls stored in ring buffer
+
+        :return list: list of dicts with keys: model, handler, call_count,
+                      total_time, query_count
+    """
+    with _buffer_lock:
+        calls = list(_buffer)
+
+    stats = collections.OrderedDict()
+    for call in calls:
+        key = (call.model, call.handler)
+        stat = stats.get(key)
+        if stat is None:
+            stat = stats[key] = {
+                'model': call.model,
+                'handler': call.handler,
+                'call_count': 0,
+                'total_time': 0.0,
+                'query_count': 0,
+            }
+        stat['call_count'] += 1
+        stat['total_time'] += call.duration
+        stat['query_count'] += call.query_count
+    return list(stats.values())
+
+
+def reset_stats():
+    """ Clean ring buffer
+    """
+    with _buffer_lock:
+        _buffer.clear()
@@ -5,9 +5,16 @@ from werkzeug import urls
 from dateutil.relativedelta import relativedelta
 from jinja2.sandbox import SandboxedEnvironment
 from odoo import tools
+from odoo.tools.lru import LRU
 
 _logger = logging.getLogger(__name__)
 
+# Max number of compiled templates cached per worker
+JINJA_TEMPLATE_CACHE_SIZE = 512
+
+_template_cache = LRU(JINJA_TEMPLATE_CACHE_SIZE)
+_default_env = None
+
 
 def prepare_jinja_template_env(env_kwargs=None, extra_context=None):
     """ Prepare custom jinja2 template environment.
@@ -50,6 +57,29 @@ def prepare_jinja_template_env(env_kwargs=None, extra_context=None):
     return env
 
 
+def get_default_jinja_template_env():
+    """ Return sandboxed environment shared by all renderings in worker
+    """
+    global _default_env  # pylint: disable=global-statement
+    if _default_env is None:
+        _default_env = prepare_jinja_template_env()
+    return _default_env
+
+
+def _compile_template(template_env, template_str):
+    """ Compile template. Templates compiled in default environment
+        are cached by source text.
+    """
+    if template_env is not get_default_jinja_template_env():
+        return template_env.from_string(tools.ustr(template_str))
+
+    template = _template_cache.get(template_str)
+    if template is None:
+        template = template_env.from_string(tools.ustr(template_str))
+        _template_cache[template_str] = template
+    return template
+
+
 def render_jinja_string(template_str, context, on_error='empty', env=None):
     """ :param str template_str: Template string to process with jinja
         :param dict context: Additional context to pass to template
@@ -60,11 +90,11 @@ def render_jinja_string(template_str, context, on_error='empty', env=None):
         :param jinja2.sandbox.SandboxedEnvironment env: specific sendbox env
            if needed
     """
-    template_env = prepare_jinja_template_env() if env is None else env
+    template_env = get_default_jinja_template_env() if env is None else env
 
     # Compile template
     try:
-        template = template_env.from_string(tools.ustr(template_str))
+        template = _compile_template(template_env, template_str)
     except Exception:
         _logger.error(
             "Cannot parse template:\n\n---\n\n%s\n\n---\n",
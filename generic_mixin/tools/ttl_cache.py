@@ -0,0 +1,68 @@
+""" Simple per-worker LRU cache with expiration of entries.
+
+    Could be used to cache results of expensive read-only computations
+    (like counters) for short time. Note, that cache is stored per worker
+    process, thus it could be invalidated only in current worker, and
+    other workers will see changes only when cached values expire.
+"""
+import time
+
+from odoo.tools.lru import LRU
+
+_MISSING = object()
+
+
+class TTLCache(object):
+    """ LRU cache, entries of which expire after 'ttl' seconds
+
+        Usage:
+
+            _my_cache = TTLCache(ttl=60)
+
+            def get_counts(self, domain):
+                key = env_cache_key(self.env, self._name, repr(domain))
+                return dict(_my_cache.get_or_compute(
+                    key, lambda: self._compute_counts(domain)))
+    """
+
+    def __init__(self, ttl, size=1024):
+        self.ttl = ttl
+        # LRU is thread-safe itself
+        self._cache = LRU(size)
+
+    def get(self, key, default=None):
+        cached = self._cache.get(key)
+        if cached and time.time() - cached[0] < self.ttl:
+            return cached[1]
+        return default
+
+    def set(self, key, value):
+        self._cache[key] = (time.time(), value)
+
+    def get_or_compute(self, key, compute):
+        """ Return cached value for key, or compute and cache it
+
+            :param key: hashable cache key
+            :param callable compute: function without arguments, that
+                                     computes value
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+
+def env_cache_key(env, *args):
+    """ Build cache key, that includes all parts of environment, that
+        could change result of search: database, user, superuser mode,
+        language, allowed companies and active_test context key.
+    """
+    return (
+        env.cr.dbname, env.uid, env.su, env.lang,
+        tuple(env.companies.ids),
+        env.context.get('active_test', True),
+    ) + args
@@ -72,11 +72,13 @@
         'wizard/request_wizard_close_views.xml',
         'wizard/request_wizard_assign.xml',
         'wizard/request_wizard_stop_work.xml',
+        'wizard/request_wizard_mass_action.xml',
 
         'templates/templates.xml',
 
         'reports/request_timesheet_report.xml',
         'reports/request_graph_reports.xml',
+        'reports/request_stage_cycle_time.xml',
     ],
 
     'demo': [
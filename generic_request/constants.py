@@ -6,6 +6,22 @@ TRACK_FIELD_CHANGES = set((
     'partner_id', 'category_id', 'priority', 'impact', 'urgency'))
 REQUEST_TEXT_SAMPLE_MAX_LINES = 3
 KANBAN_READONLY_FIELDS = set(('type_id', 'category_id', 'stage_id'))
+# Fields used by most of queries on open requests (counters, website lists,
+# user statistics). Partial indexes restricted to open requests
+# are created for these fields.
+OPEN_REQUEST_INDEXED_FIELDS = (
+    'type_id', 'user_id', 'stage_id', 'partner_id', 'deadline_date')
+# Settings of MinHash / LSH index used to detect near-duplicate requests.
+# Signature of REQUEST_DUPLICATE_NUM_PERM values is split to
+# REQUEST_DUPLICATE_BANDS bands. For each band only
+# REQUEST_DUPLICATE_CANDIDATES_PER_BAND most recent requests are taken,
+# and only REQUEST_DUPLICATE_MAX_CANDIDATES best of them are compared with
+# new request.
+REQUEST_DUPLICATE_NUM_PERM = 64
+REQUEST_DUPLICATE_BANDS = 16
+REQUEST_DUPLICATE_THRESHOLD = 0.8
+REQUEST_DUPLICATE_MAX_CANDIDATES = 10
+REQUEST_DUPLICATE_CANDIDATES_PER_BAND = 20
 MAIL_REQUEST_TEXT_TMPL = "<h1>%(subject)s</h1>\n<br/>\n<br/>%(body)s"
 
 AVAILABLE_PRIORITIES = [
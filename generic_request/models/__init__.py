@@ -18,4 +18,6 @@ from . import (
     request_timesheet_activity,
     request_timesheet_line,
     request_channel,
+    request_stage_cycle_time,
+    request_request_lsh,
 )
@@ -1,4 +1,4 @@
-from odoo import models, fields
+from odoo import models, fields, exceptions, _
 
 
 class RequestCreationTemplate(models.Model):
@@ -44,3 +44,88 @@ class RequestCreationTemplate(models.Model):
         data = self.prepare_request_data(values)
         request = self.env['request.request'].create(data)
         return request
+
+    def _validate_requests_data(self, data_list):
+        """ Validate list of prepared request values in one pass.
+
+            :param list data_list: list of dicts prepared by
+                                   'prepare_request_data'
+            :raises ValidationError: if some of values are not valid
+        """
+        type_ids = set(d['type_id'] for d in data_list if d.get('type_id'))
+        types = self.env['request.type'].browse(type_ids).exists()
+        bad_types = types.filtered(lambda t: not t.start_stage_id)
+
+        errors = []
+        for index, data in enumerate(data_list):
+            if not data.get('type_id') or data['type_id'] not in types.ids:
+                errors.append(_("#%s: request type is not valid") % index)
+            elif data['type_id'] in bad_types.ids:
+                errors.append(
+                    _("#%s: request type '%s' has no start stage") % (
+                        index, bad_types.browse(data['type_id']).name))
+        if errors:
+            raise exceptions.ValidationError(
+                _("Cannot create requests:\n%s") % "\n".join(errors))
+
+    def do_create_requests(self, values_list):
+        """ Create multiple requests from this template at once.
+
+            Each item of values_list may contain key 'idempotency_key'.
+            Requests with keys that already exist in database will not be
+            created again, instead ID of existing request will be returned.
+            This way, it is safe to retry the same batch.
+            Only keys of requests created by current user could be reused.
+
+            :param list values_list: list of dicts with request values
+            :return list: IDs of requests in same order as values_list
+        """
+        self.ensure_one()
+        Request = self.env['request.request']
+
+        data_list = [self.prepare_request_data(v) for v in values_list]
+        self._validate_requests_data(data_list)
+
+        # Find requests that were already created by previous calls.
+        # Sudo is required, because key is unique over all requests,
+        # including ones that are not visible to current user
+        keys = set(d['idempotency_key']
+                   for d in data_list if d.get('idempotency_key'))
+        existing = {}
+        if keys:
+            for r in Request.sudo().with_context(
+                    active_test=False).search_read(
+                    [('idempotency_key', 'in', list(keys))],
+                    ['idempotency_key', 'created_by_id']):
+                if r['created_by_id'] and \
+                        r['created_by_id'][0] == self.env.uid:
+                    existing[r['idempotency_key']] = r['id']
+                else:
+                    # Do not expose IDs of requests of other users
+                    raise exceptions.AccessError(_(
+                        "Idempotency key '%s' is already used "
+                        "by another user") % r['idempotency_key'])
+
+        # Skip already created requests and duplicates inside the batch
+        to_create = []
+        for data in data_list:
+            key = data.get('idempotency_key')
+            if not key or key not in existing:
+                to_create.append(data)
+            if key and key not in existing:
+                # Will be filled with ID of request after creation
+                existing[key] = False
+
+        new_ids = iter(Request.create(to_create).ids)
+
+        result = []
+        for data in data_list:
+            key = data.get('idempotency_key')
+            if key and existing[key]:
+                result.append(existing[key])
+                continue
+            request_id = next(new_ids)
+            if key:
+                existing[key] = request_id
+            result.append(request_id)
+        return result
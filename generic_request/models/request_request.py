@@ -1,11 +1,16 @@
 # pylint:disable=too-many-lines
+import base64
+import binascii
 import logging
+import threading
 from datetime import datetime
+from dateutil.relativedelta import relativedelta
 from odoo import models, fields, api, tools, _, exceptions, SUPERUSER_ID
 from odoo.addons.generic_mixin import pre_write, post_write
+from odoo.addons.generic_mixin.tools import handler_stats
 from odoo import http
 from odoo.osv import expression
-from ..tools.utils import html2text
+from ..tools.utils import html2text, has_inline_images, INLINE_IMAGE_RE
 from ..constants import (
     TRACK_FIELD_CHANGES,
     REQUEST_TEXT_SAMPLE_MAX_LINES,
@@ -15,6 +20,7 @@ from ..constants import (
     AVAILABLE_IMPACTS,
     AVAILABLE_URGENCIES,
     PRIORITY_MAP,
+    OPEN_REQUEST_INDEXED_FIELDS,
 )
 _logger = logging.getLogger(__name__)
 
@@ -219,6 +225,11 @@ class RequestRequest(models.Model):
     original_message_id = fields.Char(
         help='Technical field. '
              'ID of original message that started this request.')
+    duplicate_of_id = fields.Many2one(
+        'request.request', 'Possible duplicate of', index=True,
+        readonly=True, copy=False, ondelete='set null',
+        help="Older request of same partner or same type, that have "
+             "very similar request text.")
     attachment_ids = fields.One2many(
         'ir.attachment', 'res_id',
         domain=[('res_model', '=', 'request.request')],
@@ -263,12 +274,51 @@ class RequestRequest(models.Model):
     use_timesheet = fields.Boolean(
         related='type_id.use_timesheet', readonly=True)
 
+    active = fields.Boolean(
+        default=True, index=True,
+        help="Closed requests could be archived automatically "
+             "after some time to speed up work with open requests.")
+
+    # Used by bulk creation API to avoid duplicates on retried batches
+    idempotency_key = fields.Char(
+        readonly=True, copy=False,
+        help="Technical field. Unique key provided by external system "
+             "on request creation. Used to prevent creation of duplicate "
+             "requests when the same batch is sent again.")
+
     _sql_constraints = [
         ('name_uniq',
          'UNIQUE (name)',
          'Request name must be unique.'),
+        ('idempotency_key_uniq',
+         'UNIQUE (idempotency_key)',
+         'Request idempotency key must be unique.'),
     ]
 
+    def init(self):
+        res = super(RequestRequest, self).init()
+
+        # Partial indexes for open requests.
+        # Note, that predicate have to be exactly the same as SQL generated
+        # by ORM for domain [('closed', '=', False)], otherwise PostgreSQL
+        # will not be able to use these indexes.
+        for field_name in OPEN_REQUEST_INDEXED_FIELDS:
+            index_name = '%s_open_%s_index' % (self._table, field_name)
+            if tools.index_exists(self.env.cr, index_name):
+                continue
+            # pylint: disable=sql-injection
+            self.env.cr.execute("""
+                CREATE INDEX "%(index_name)s"
+                ON "%(table)s" ("%(column)s")
+                WHERE ("%(table)s"."closed" IS NULL
+                       OR "%(table)s"."closed" = false)
+            """ % {  # nosec
+                'index_name': index_name,
+                'table': self._table,
+                'column': field_name,
+            })
+        return res
+
     @api.model
     def default_get(self, fields_list):
         res = super(RequestRequest, self).default_get(fields_list)
@@ -513,19 +563,212 @@ class RequestRequest(models.Model):
                 res['partner_id'] = author.commercial_partner_id.id
         return res
 
-    @api.model
-    def create(self, vals):
+    def _create_prepare_vals(self, vals):
+        """ Prepare values of single request to be passed to 'create'
+        """
         # Update date_assigned
         if vals.get('user_id'):
             vals['date_assigned'] = fields.Datetime.now()
         if vals.get('type_id', False):
             r_type = self.env['request.type'].browse(vals['type_id'])
             vals = self._create_update_from_type(r_type, vals)
+        return vals
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        vals_list = [self._create_prepare_vals(vals) for vals in vals_list]
+
+        # Move inline images to attachments, and attach them to requests
+        # after requests created
+        inline_images = []
+        for vals in vals_list:
+            if has_inline_images(vals.get('request_text')):
+                vals['request_text'], attachments = (
+                    self.browse()._extract_inline_images(
+                        vals['request_text']))
+            else:
+                attachments = self.env['ir.attachment'].browse()
+            inline_images.append(attachments)
 
         self_ctx = self.with_context(mail_create_nolog=False)
-        request = super(RequestRequest, self_ctx).create(vals)
-        request.trigger_event('created')
-        return request
+        requests = super(RequestRequest, self_ctx).create(vals_list)
+        for request, attachments in zip(requests, inline_images):
+            if attachments:
+                attachments.write({'res_id': request.id})
+        requests._request_partner_rel_update()
+        requests._duplicate_index_update(detect=True)
+        for request in requests:
+            request.trigger_event('created')
+        return requests
+
+    def write(self, vals):
+        if has_inline_images(vals.get('request_text')):
+            if len(self) > 1:
+                # Images have to be attached to each request separately
+                for record in self:
+                    record.write(vals)
+                return True
+            vals = dict(vals)
+            vals['request_text'] = self._extract_inline_images(
+                vals['request_text'])[0]
+
+        res = super(RequestRequest, self).write(vals)
+        if 'partner_id' in vals or 'author_id' in vals:
+            self._request_partner_rel_update()
+        if 'request_text' in vals:
+            self._duplicate_index_update()
+        return res
+
+    def _duplicate_index_update(self, detect=False):
+        """ Update near-duplicate index for requests in self.
+
+            :param bool detect: if set, then find out requests that
+                                requests in self are duplicates of, and
+                                save them in 'duplicate_of_id' field
+        """
+        Index = self.env['request.request.lsh'].sudo()
+        indexed = Index._index_requests(self)
+        if not detect:
+            return
+        for request in self:
+            shingles, band_hashes = indexed[request.id]
+            duplicate = Index._find_duplicate(
+                request.sudo(), shingles, band_hashes)
+            if duplicate:
+                request.sudo().duplicate_of_id = duplicate
+
+    def _request_partner_rel_update(self):
+        """ Update relation between requests and partners (partner's field
+            'request_ids') only for requests in self.
+            Partners that are not related to requests anymore will be
+            removed from relation, and new partners will be added.
+        """
+        if not self.ids:
+            return
+        self.flush(['partner_id', 'author_id'])
+        self.env.cr.execute("""
+            DELETE FROM request_request_partner_author_rel AS rel
+            USING request_request AS rr
+            WHERE rr.id = rel.request_id
+              AND rr.id IN %(request_ids)s
+              AND rel.partner_id IS DISTINCT FROM rr.partner_id
+              AND rel.partner_id IS DISTINCT FROM rr.author_id;
+
+            INSERT INTO request_request_partner_author_rel
+                (partner_id, request_id)
+            SELECT rr.partner_id, rr.id
+            FROM request_request AS rr
+            WHERE rr.id IN %(request_ids)s
+              AND rr.partner_id IS NOT NULL
+            UNION
+            SELECT rr.author_id, rr.id
+            FROM request_request AS rr
+            WHERE rr.id IN %(request_ids)s
+              AND rr.author_id IS NOT NULL
+            ON CONFLICT DO NOTHING;
+        """, {
+            'request_ids': tuple(self.ids),
+        })
+        self.env['res.partner'].invalidate_cache(
+            ['request_ids', 'request_count'])
+
+    def _extract_inline_images(self, html):
+        """ Move inline (base64-encoded) images from html to attachments
+            and replace them with links to these attachments.
+
+            Images are deduplicated by checksum: same image embedded
+            multiple times is stored only once, and images already attached
+            to request (self) are reused.
+
+            :param str html: html to extract images from
+            :return tuple: (new html, attachments created)
+        """
+        Attachment = self.env['ir.attachment'].sudo()
+        created = Attachment.browse()
+        by_checksum = {}
+        if self:
+            self.ensure_one()
+            for attachment in Attachment.search([
+                    ('res_model', '=', self._name),
+                    ('res_id', '=', self.id),
+                    ('mimetype', '=like', 'image/%')]):
+                by_checksum.setdefault(attachment.checksum, attachment)
+
+        def replace_image(match):
+            nonlocal created
+            start, mimetype, data, end = match.groups()
+            data = ''.join(data.split())
+            try:
+                raw = base64.b64decode(data, validate=True)
+            except (binascii.Error, ValueError):
+                # Leave broken images as is
+                return match.group(0)
+
+            checksum = Attachment._compute_checksum(raw)
+            attachment = by_checksum.get(checksum)
+            if not attachment:
+                attachment = Attachment.create({
+                    'name': "image-%s.%s" % (
+                        checksum[:8], mimetype.split('/')[-1]),
+                    'datas': data,
+                    'mimetype': mimetype,
+                    'res_model': self._name,
+                    'res_id': self.id or False,
+                })
+                attachment.generate_access_token()
+                by_checksum[checksum] = attachment
+                created |= attachment
+            return "%s/web/image/%s?access_token=%s%s" % (
+                start, attachment.id, attachment.access_token, end)
+
+        return INLINE_IMAGE_RE.sub(replace_image, html), created
+
+    @api.model
+    def _scheduler_extract_inline_images(self, batch_size=100,
+                                         auto_commit=None):
+        """ Move inline images from request text of existing requests to
+            attachments. Requests are processed in batches, and (when not
+            in test mode) each batch is committed separately.
+
+            Request text is updated directly in database, thus
+            no events and no tracking messages are generated.
+        """
+        if auto_commit is None:
+            auto_commit = not getattr(
+                threading.currentThread(), 'testing', False)
+
+        self.flush(['request_text'])
+        last_id = 0
+        while True:
+            self.env.cr.execute("""
+                SELECT id
+                FROM request_request
+                WHERE id > %(last_id)s
+                  AND request_text LIKE '%%data:image/%%;base64,%%'
+                ORDER BY id
+                LIMIT %(limit)s
+            """, {'last_id': last_id, 'limit': batch_size})
+            request_ids = [r[0] for r in self.env.cr.fetchall()]
+            if not request_ids:
+                break
+
+            requests = self.with_context(active_test=False).browse(
+                request_ids)
+            for request in requests:
+                html = request._extract_inline_images(
+                    request.request_text)[0]
+                if html != request.request_text:
+                    self.env.cr.execute("""
+                        UPDATE request_request
+                        SET request_text = %(request_text)s
+                        WHERE id = %(request_id)s
+                    """, {'request_text': html, 'request_id': request.id})
+            self.invalidate_cache(['request_text'], request_ids)
+            _logger.info(
+                "Extracted inline images from %s requests", len(request_ids))
+            last_id = request_ids[-1]
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
 
     def _get_generic_tracking_fields(self):
         """ Compute list of fields that have to be tracked
@@ -550,7 +793,18 @@ class RequestRequest(models.Model):
     def _before_stage_id_changed(self, changes):
         Route = self.env['request.stage.route']
         old_stage, new_stage = changes['stage_id']
-        route = Route.ensure_route(self, new_stage.id)
+
+        # Route could be already found for group of requests
+        # (for example by mass action wizard), thus we could avoid searching
+        # it for each request, but still have to check access to it
+        route_id = self.env.context.get('request_stage_route_id', False)
+        route = Route.browse(route_id if isinstance(route_id, int) else [])
+        if (route and route.request_type_id == self.type_id and
+                route.stage_from_id == old_stage and
+                route.stage_to_id == new_stage):
+            route._ensure_can_move(self)
+        else:
+            route = Route.ensure_route(self, new_stage.id)
         route.hook_before_stage_change(self)
 
         vals = {}
@@ -912,6 +1166,11 @@ class RequestRequest(models.Model):
     def handle_request_event(self, event):
         """ Place to handle request events
         """
+        if event.event_type_id.code in ('created', 'stage-changed',
+                                        'closed', 'reopened'):
+            self.env['request.stage.cycle.time'].sudo(
+            )._register_stage_change(self, self.stage_id, event.date)
+
         if event.event_type_id.code in ('assigned', 'reassigned'):
             self._send_default_notification_assigned(event)
         elif event.event_type_id.code == 'created':
@@ -937,7 +1196,13 @@ class RequestRequest(models.Model):
             'date': fields.Datetime.now(),
         })
         event = self.env['request.event'].sudo().create(event_data)
-        self.handle_request_event(event)
+        if handler_stats.is_enabled(self.env):
+            with handler_stats.track_handler(
+                    self.env, self._name,
+                    'handle_request_event:%s' % event_type):
+                self.handle_request_event(event)
+        else:
+            self.handle_request_event(event)
 
     def get_mail_url(self):
         """ Get request URL to be used in mails
@@ -1113,6 +1378,51 @@ class RequestRequest(models.Model):
             message, msg_vals, *args, **kwargs
         )
 
+    @api.model
+    def _scheduler_archive_closed_requests(self, batch_size=1000,
+                                           auto_commit=None):
+        """ Archive requests that were closed more than N days ago.
+            Archiving is configured in settings of each company, and
+            applied to requests created by users of that company.
+
+            Requests are archived in batches, and (when not in test mode)
+            each batch is committed separately.
+        """
+        if auto_commit is None:
+            auto_commit = not getattr(
+                threading.currentThread(), 'testing', False)
+
+        companies = self.env['res.company'].sudo().search([
+            ('request_archive_closed_auto', '=', True),
+            ('request_archive_closed_after_days', '>', 0),
+        ])
+        for company in companies:
+            archive_date = datetime.now() - relativedelta(
+                days=company.request_archive_closed_after_days)
+            domain = [
+                ('created_by_id.company_id', '=', company.id),
+                ('closed', '=', True),
+                ('date_closed', '<',
+                 fields.Datetime.to_string(archive_date)),
+            ]
+            # Archived requests are not found by next search, thus just
+            # search for next batch until there is nothing to archive
+            while True:
+                requests = self.sudo().search(domain, limit=batch_size)
+                if not requests:
+                    break
+                requests.write({'active': False})
+                _logger.info(
+                    "Archived %s closed requests of company %s",
+                    len(requests), company.name)
+                if auto_commit:
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+
+    def action_request_restore(self):
+        """ Restore archived requests
+        """
+        self.filtered(lambda r: not r.active).write({'active': True})
+
     def action_show_request_events(self):
         self.ensure_one()
         return self.env['generic.mixin.get.action'].get_action_by_xmlid(
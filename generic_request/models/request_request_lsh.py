@@ -0,0 +1,185 @@
+import logging
+import threading
+
+from odoo import models, fields, api, tools
+
+from ..tools.minhash import (
+    text_shingles,
+    minhash_signature,
+    lsh_band_hashes,
+    jaccard_similarity,
+)
+from ..constants import (
+    REQUEST_DUPLICATE_NUM_PERM,
+    REQUEST_DUPLICATE_BANDS,
+    REQUEST_DUPLICATE_THRESHOLD,
+    REQUEST_DUPLICATE_MAX_CANDIDATES,
+    REQUEST_DUPLICATE_CANDIDATES_PER_BAND,
+)
+
+_logger = logging.getLogger(__name__)
+
+
+class RequestRequestLSH(models.Model):
+    """ LSH index over MinHash signatures of request texts.
+
+        Each request has REQUEST_DUPLICATE_BANDS rows in this table
+        (one per band of signature). Requests that have equal band hash
+        are candidates to be near-duplicates.
+    """
+    _name = 'request.request.lsh'
+    _description = 'Request: Near-Duplicate Index'
+    _log_access = False
+
+    request_id = fields.Many2one(
+        'request.request', index=True, required=True, readonly=True,
+        ondelete='cascade')
+    # Indexed together with request_id (see init)
+    band_hash = fields.Integer(required=True, readonly=True)
+
+    def init(self):
+        res = super(RequestRequestLSH, self).init()
+
+        # Used to find most recent requests with same band hash
+        index_name = '%s_band_hash_request_id_index' % self._table
+        if not tools.index_exists(self.env.cr, index_name):
+            tools.create_index(
+                self.env.cr, index_name, self._table,
+                ['band_hash', 'request_id DESC'])
+        return res
+
+    @api.model
+    def _compute_band_hashes(self, shingles):
+        return lsh_band_hashes(
+            minhash_signature(shingles, num_perm=REQUEST_DUPLICATE_NUM_PERM),
+            bands=REQUEST_DUPLICATE_BANDS)
+
+    @api.model
+    def _index_requests(self, requests):
+        """ (Re)index specified requests
+
+            :param Recordset requests: requests to index
+            :return dict: {request_id: (shingles, band_hashes)}
+        """
+        res = {}
+        index_request_ids = []
+        index_band_hashes = []
+        for request in requests:
+            shingles = text_shingles(request.request_text)
+            band_hashes = self._compute_band_hashes(shingles)
+            res[request.id] = (shingles, band_hashes)
+            index_request_ids += [request.id] * len(band_hashes)
+            index_band_hashes += band_hashes
+
+        if not requests:
+            return res
+
+        self.env.cr.execute("""
+            DELETE FROM request_request_lsh
+            WHERE request_id IN %(request_ids)s
+        """, {'request_ids': tuple(requests.ids)})
+        if index_request_ids:
+            self.env.cr.execute("""
+                INSERT INTO request_request_lsh (request_id, band_hash)
+                SELECT UNNEST(%(request_ids)s::integer[]),
+                       UNNEST(%(band_hashes)s::integer[])
+            """, {
+                'request_ids': index_request_ids,
+                'band_hashes': index_band_hashes,
+            })
+        self.invalidate_cache()
+        return res
+
+    @api.model
+    def _find_duplicate(self, request, shingles, band_hashes):
+        """ Find request that request is near-duplicate of.
+
+            Only older requests of same partner or same type are checked.
+            For each band, only REQUEST_DUPLICATE_CANDIDATES_PER_BAND most
+            recent matching requests are taken into account, thus cost of
+            this search does not grow with number of similar requests.
+
+            :return Recordset: found request or empty recordset
+        """
+        Request = self.env['request.request']
+        if not band_hashes:
+            return Request.browse()
+
+        Request.flush(['partner_id', 'type_id', 'active'])
+        self.env.cr.execute("""
+            SELECT c.request_id
+            FROM UNNEST(%(band_hashes)s::integer[]) AS b(band_hash)
+            CROSS JOIN LATERAL (
+                SELECT l.request_id
+                FROM request_request_lsh AS l
+                JOIN request_request AS rr ON rr.id = l.request_id
+                WHERE l.band_hash = b.band_hash
+                  AND l.request_id < %(request_id)s
+                  AND rr.active IS TRUE
+                  AND (rr.partner_id = %(partner_id)s
+                       OR rr.type_id = %(type_id)s)
+                ORDER BY l.request_id DESC
+                LIMIT %(per_band)s
+            ) AS c
+            GROUP BY c.request_id
+            ORDER BY COUNT(*) DESC, c.request_id DESC
+            LIMIT %(limit)s
+        """, {
+            'band_hashes': list(set(band_hashes)),
+            'request_id': request.id,
+            'partner_id': request.partner_id.id or None,
+            'type_id': request.type_id.id,
+            'per_band': REQUEST_DUPLICATE_CANDIDATES_PER_BAND,
+            'limit': REQUEST_DUPLICATE_MAX_CANDIDATES,
+        })
+        candidates = Request.browse([r[0] for r in self.env.cr.fetchall()])
+
+        best, best_similarity = Request.browse(), 0.0
+        for candidate in candidates:
+            similarity = jaccard_similarity(
+                shingles, text_shingles(candidate.request_text))
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+
+        if best_similarity >= REQUEST_DUPLICATE_THRESHOLD:
+            return best
+        return Request.browse()
+
+    @api.model
+    def _rebuild_index(self, batch_size=1000, auto_commit=None):
+        """ Index requests that are not indexed yet, in batches.
+
+            :param int batch_size: number of requests to index per batch
+            :param bool auto_commit: commit transaction after each batch.
+                                     By default, commits are enabled
+                                     only when not in test mode.
+        """
+        if auto_commit is None:
+            auto_commit = not getattr(
+                threading.currentThread(), 'testing', False)
+
+        Request = self.env['request.request'].with_context(active_test=False)
+        last_id = 0
+        while True:
+            self.env.cr.execute("""
+                SELECT rr.id
+                FROM request_request AS rr
+                WHERE rr.id > %(last_id)s
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM request_request_lsh AS l
+                      WHERE l.request_id = rr.id)
+                ORDER BY rr.id
+                LIMIT %(limit)s
+            """, {'last_id': last_id, 'limit': batch_size})
+            request_ids = [r[0] for r in self.env.cr.fetchall()]
+            if not request_ids:
+                break
+            _logger.info(
+                "Indexing %s requests for duplicate detection",
+                len(request_ids))
+            self._index_requests(Request.browse(request_ids))
+            Request.invalidate_cache(['request_text'], request_ids)
+            last_id = request_ids[-1]
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
@@ -0,0 +1,177 @@
+import logging
+import threading
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+
+class RequestStageCycleTime(models.Model):
+    """ Time spent by requests in each stage.
+
+        Each row represents single visit of request to stage.
+        Rows are created when request is created or moved to new stage
+        (see `request.request.handle_request_event`), and rows created
+        before installation of this feature could be computed from
+        request events via `_backfill_from_events` method.
+    """
+    _name = 'request.stage.cycle.time'
+    _description = 'Request Stage Cycle Time'
+    _order = 'date_entered DESC, id DESC'
+    _log_access = False
+
+    request_id = fields.Many2one(
+        'request.request', index=True, required=True, readonly=True,
+        ondelete='cascade')
+    request_type_id = fields.Many2one(
+        'request.type', index=True, readonly=True, ondelete='cascade')
+    stage_id = fields.Many2one(
+        'request.stage', index=True, required=True, readonly=True,
+        ondelete='cascade')
+    date_entered = fields.Datetime(required=True, index=True, readonly=True)
+    date_left = fields.Datetime(index=True, readonly=True)
+    duration = fields.Float(
+        readonly=True, group_operator='avg',
+        help="Time (in hours) spent by request in this stage")
+
+    @api.model
+    def _register_stage_change(self, request, stage, date):
+        """ Close current (open) stage row of request and open new one
+
+            :param Recordset request: single request that was moved
+            :param Recordset stage: stage request was moved to
+            :param datetime date: date of move
+        """
+        open_rows = self.search([
+            ('request_id', '=', request.id),
+            ('date_left', '=', False),
+        ])
+        for row in open_rows:
+            row.write({
+                'date_left': date,
+                'duration': (
+                    date - row.date_entered).total_seconds() / 3600.0,
+            })
+        return self.create({
+            'request_id': request.id,
+            'request_type_id': request.type_id.id,
+            'stage_id': stage.id,
+            'date_entered': date,
+        })
+
+    @api.model
+    def _backfill_from_events(self, batch_size=1000, auto_commit=None):
+        """ Compute missing cycle time rows using request events.
+            Requests are processed in batches, and (when not in test mode)
+            each batch is committed separately.
+
+            Rows are deduplicated per stage visit (request, stage and date
+            request entered stage), thus rows of requests that already have
+            some rows (for example created after installation of this
+            feature) are computed only for earlier visits.
+
+            Note, that events could be removed by vacuum, thus for old
+            requests, results could be incomplete.
+        """
+        if auto_commit is None:
+            auto_commit = not getattr(
+                threading.currentThread(), 'testing', False)
+
+        self.env['request.request'].flush()
+        self.env['request.event'].flush()
+        self.flush()
+
+        last_id = 0
+        while True:
+            self.env.cr.execute("""
+                SELECT id
+                FROM request_request
+                WHERE id > %(last_id)s
+                ORDER BY id
+                LIMIT %(limit)s
+            """, {'last_id': last_id, 'limit': batch_size})
+            request_ids = tuple(r[0] for r in self.env.cr.fetchall())
+            if not request_ids:
+                break
+            last_id = request_ids[-1]
+
+            # Request enters its first stage on creation. Live rows use
+            # date of 'created' event, thus use it too, if it is available
+            self.env.cr.execute("""
+                WITH moves AS (
+                    SELECT e.request_id,
+                           e.old_stage_id,
+                           e.new_stage_id,
+                           e.date,
+                           ROW_NUMBER() OVER w AS seq,
+                           LEAD(e.date) OVER w AS next_date
+                    FROM request_event AS e
+                    WHERE e.request_id IN %(request_ids)s
+                      AND e.new_stage_id IS NOT NULL
+                    WINDOW w AS (PARTITION BY e.request_id
+                                 ORDER BY e.date, e.id)
+                ),
+                requests AS (
+                    SELECT rr.id,
+                           rr.type_id,
+                           rr.stage_id,
+                           COALESCE((
+                               SELECT MIN(e.date)
+                               FROM request_event AS e
+                               JOIN request_event_type AS et
+                                    ON et.id = e.event_type_id
+                               WHERE e.request_id = rr.id
+                                 AND et.code = 'created'
+                           ), rr.date_created) AS date_created
+                    FROM request_request AS rr
+                    WHERE rr.id IN %(request_ids)s
+                ),
+                visits (request_id, request_type_id, stage_id,
+                        date_entered, date_left) AS (
+                    -- Stage request was created in
+                    SELECT r.id, r.type_id, m.old_stage_id,
+                           r.date_created, m.date
+                    FROM moves AS m
+                    JOIN requests AS r ON r.id = m.request_id
+                    WHERE m.seq = 1
+                      AND m.old_stage_id IS NOT NULL
+
+                    UNION ALL
+
+                    -- Stages request was moved to
+                    SELECT r.id, r.type_id, m.new_stage_id,
+                           m.date, m.next_date
+                    FROM moves AS m
+                    JOIN requests AS r ON r.id = m.request_id
+
+                    UNION ALL
+
+                    -- Requests that were never moved
+                    SELECT r.id, r.type_id, r.stage_id,
+                           r.date_created, NULL
+                    FROM requests AS r
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM moves AS m
+                        WHERE m.request_id = r.id)
+                )
+                INSERT INTO request_stage_cycle_time
+                    (request_id, request_type_id, stage_id,
+                     date_entered, date_left, duration)
+                SELECT v.request_id, v.request_type_id, v.stage_id,
+                       v.date_entered, v.date_left,
+                       EXTRACT(EPOCH FROM v.date_left - v.date_entered
+                               ) / 3600.0
+                FROM visits AS v
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM request_stage_cycle_time AS ct
+                    WHERE ct.request_id = v.request_id
+                      AND ct.stage_id = v.stage_id
+                      AND ct.date_entered = v.date_entered)
+            """, {'request_ids': request_ids})
+            _logger.info(
+                "Computed stage cycle time for %s requests (%s rows added)",
+                len(request_ids), self.env.cr.rowcount)
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+        self.invalidate_cache()
@@ -13,5 +13,12 @@ class ResCompany(models.Model):
         string='Automatically remove events older then',
         default=True)
 
+    request_archive_closed_auto = fields.Boolean(
+        string='Automatically archive closed requests',
+        default=False)
+    request_archive_closed_after_days = fields.Integer(
+        string='Archive closed requests after (days)',
+        default=365)
+
     request_mail_suggest_partner = fields.Boolean(
         string="Suggest request partner for mail recipients")
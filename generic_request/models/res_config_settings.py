@@ -195,6 +195,11 @@ class ResConfigSettings(models.TransientModel):
     )
     request_event_auto_remove = fields.Boolean(
         related='company_id.request_event_auto_remove', readonly=False)
+    request_archive_closed_auto = fields.Boolean(
+        related='company_id.request_archive_closed_auto', readonly=False)
+    request_archive_closed_after_days = fields.Integer(
+        related='company_id.request_archive_closed_after_days',
+        readonly=False)
     request_mail_suggest_partner = fields.Boolean(
         related='company_id.request_mail_suggest_partner', readonly=False)
     group_request_show_stat_on_kanban_views = fields.Boolean(
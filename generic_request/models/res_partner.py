@@ -11,22 +11,67 @@ class ResPartner(models.Model):
     request_by_author_ids = fields.One2many(
         'request.request', 'author_id',
         readonly=True, copy=False)
+
+    # This relation is maintained incrementally by request.request
+    # (see `_request_partner_rel_update` method), thus there is no need to
+    # recompute it for all requests of partner on every change of request.
     request_ids = fields.Many2many(
         'request.request',
         'request_request_partner_author_rel',
         'partner_id', 'request_id',
-        readonly=True, copy=False, store=True,
-        compute='_compute_request_data')
+        readonly=True, copy=False)
     request_count = fields.Integer(
-        'Requests', compute='_compute_request_data',
-        store=True, readonly=True)
+        'Requests', compute='_compute_request_count', readonly=True)
 
-    @api.depends('request_by_partner_ids', 'request_by_author_ids')
-    def _compute_request_data(self):
+    def _compute_request_count(self):
+        counts = {}
+        if self.ids:
+            self.env['request.request'].flush(['active'])
+            self.env.cr.execute("""
+                SELECT rel.partner_id, COUNT(*)
+                FROM request_request_partner_author_rel AS rel
+                JOIN request_request AS rr ON rr.id = rel.request_id
+                WHERE rel.partner_id IN %(partner_ids)s
+                  AND rr.active IS TRUE
+                GROUP BY rel.partner_id
+            """, {
+                'partner_ids': tuple(self.ids),
+            })
+            counts = dict(self.env.cr.fetchall())
         for record in self:
-            record.request_ids = (
-                record.request_by_partner_ids + record.request_by_author_ids)
-            record.request_count = len(record.request_ids)
+            record.request_count = counts.get(record.id, 0)
+
+    @api.model
+    def _request_partner_rel_rebuild(self):
+        """ Rebuild whole relation between partners and requests
+            (request_ids field) in batch mode.
+
+            Could be used to repair relation, for example after direct
+            changes of requests in database.
+        """
+        self.env['request.request'].flush(['partner_id', 'author_id'])
+        self.env.cr.execute("""
+            DELETE FROM request_request_partner_author_rel AS rel
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM request_request AS rr
+                WHERE rr.id = rel.request_id
+                  AND (rr.partner_id = rel.partner_id
+                       OR rr.author_id = rel.partner_id)
+            );
+
+            INSERT INTO request_request_partner_author_rel
+                (partner_id, request_id)
+            SELECT rr.partner_id, rr.id
+            FROM request_request AS rr
+            WHERE rr.partner_id IS NOT NULL
+            UNION
+            SELECT rr.author_id, rr.id
+            FROM request_request AS rr
+            WHERE rr.author_id IS NOT NULL
+            ON CONFLICT DO NOTHING;
+        """)
+        self.invalidate_cache(['request_ids', 'request_count'])
 
     def action_show_related_requests(self):
         self.ensure_one()
@@ -1 +1,2 @@
 from . import request_timesheet_report
+from . import request_stage_cycle_time_report
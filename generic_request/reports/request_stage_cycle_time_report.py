@@ -0,0 +1,45 @@
+from odoo import models, fields, tools
+
+
+class RequestStageCycleTimeReport(models.Model):
+    _name = "request.stage.cycle.time.report"
+    _description = "Request Stage Cycle Time Report"
+    _auto = False
+    _order = 'request_type_id, stage_id'
+
+    request_type_id = fields.Many2one('request.type', readonly=True)
+    stage_id = fields.Many2one('request.stage', readonly=True)
+    visit_count = fields.Integer(readonly=True)
+    duration_avg = fields.Float(
+        'Average (hours)', readonly=True, group_operator='avg')
+    # Percentiles of group could not be computed from percentiles
+    # of subgroups, thus they are not aggregated
+    duration_p50 = fields.Float(
+        'Median (hours)', readonly=True, group_operator=False)
+    duration_p90 = fields.Float(
+        '90th percentile (hours)', readonly=True, group_operator=False)
+    duration_max = fields.Float(
+        'Maximum (hours)', readonly=True, group_operator='max')
+
+    def init(self):
+        # pylint: disable=sql-injection
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE or REPLACE VIEW %(view_name)s as (
+            SELECT
+                MIN(ct.id) AS id,
+                ct.request_type_id,
+                ct.stage_id,
+                COUNT(*) AS visit_count,
+                AVG(ct.duration) AS duration_avg,
+                PERCENTILE_CONT(0.5) WITHIN GROUP (
+                    ORDER BY ct.duration) AS duration_p50,
+                PERCENTILE_CONT(0.9) WITHIN GROUP (
+                    ORDER BY ct.duration) AS duration_p90,
+                MAX(ct.duration) AS duration_max
+            FROM request_stage_cycle_time AS ct
+            WHERE ct.date_left IS NOT NULL
+            GROUP BY ct.request_type_id, ct.stage_id
+        )""" % {  # nosec
+            'view_name': self._table,
+        })
@@ -6,4 +6,5 @@ from . import (
     test_mail,
     test_request_timesheet,
     test_rpc_channel,
+    test_request_tags,
 )
@@ -3,6 +3,7 @@ from psycopg2 import IntegrityError
 
 from odoo import exceptions
 from odoo.tools.misc import mute_logger
+from odoo.addons.generic_mixin.tools import handler_stats
 
 from .common import RequestCase, freeze_time
 from ..models.request_request import html2text
@@ -588,6 +589,285 @@ class TestRequestBase(RequestCase):
         self.assertEqual(
             request.request_text, self.creation_template.request_text)
 
+    def test_request_creation_template_bulk(self):
+        request_ids = self.creation_template.do_create_requests([
+            {'idempotency_key': 'bulk-1'},
+            {'idempotency_key': 'bulk-2'},
+            {'idempotency_key': 'bulk-1'},
+            {},
+        ])
+        self.assertEqual(len(request_ids), 4)
+        self.assertEqual(request_ids[0], request_ids[2])
+        self.assertEqual(len(set(request_ids)), 3)
+
+        requests = self.env['request.request'].browse(request_ids)
+        self.assertEqual(
+            requests.mapped('type_id'), self.creation_template.request_type_id)
+        self.assertTrue(all(r.request_event_ids for r in requests))
+
+        # Retry of same batch must not create new requests
+        retry_ids = self.creation_template.do_create_requests([
+            {'idempotency_key': 'bulk-1'},
+            {'idempotency_key': 'bulk-2'},
+        ])
+        self.assertEqual(retry_ids, request_ids[:2])
+
+    def test_request_creation_template_bulk_validation(self):
+        with self.assertRaises(exceptions.ValidationError):
+            self.creation_template.do_create_requests([
+                {},
+                {'type_id': False},
+            ])
+
+    def test_request_creation_template_bulk_other_user_key(self):
+        self.creation_template.do_create_requests([
+            {'idempotency_key': 'bulk-other-1'},
+        ])
+        with self.assertRaises(exceptions.AccessError):
+            self.creation_template.with_user(
+                self.request_manager).do_create_requests([
+                    {'idempotency_key': 'bulk-other-1'},
+                ])
+
+    def test_request_archive_closed(self):
+        Request = self.env['request.request']
+        with freeze_time('2018-07-09'):
+            request = Request.create({
+                'type_id': self.simple_type.id,
+                'request_text': 'Test',
+            })
+            request.stage_id = self.stage_sent
+            self._close_request(request, self.stage_confirmed)
+            self.assertTrue(request.date_closed)
+
+            # Request of company, that does not archive closed requests
+            company_2 = self.env['res.company'].create({
+                'name': 'Test company 2',
+            })
+            user_2 = self.env['res.users'].create({
+                'name': 'Test user company 2',
+                'login': 'test-user-company-2',
+                'company_id': company_2.id,
+                'company_ids': [(6, 0, company_2.ids)],
+            })
+            request_2 = Request.create({
+                'type_id': self.simple_type.id,
+                'request_text': 'Test company 2',
+                'created_by_id': user_2.id,
+            })
+            request_2.stage_id = self.stage_sent
+            self._close_request(request_2, self.stage_confirmed)
+
+        self.env.user.company_id.write({
+            'request_archive_closed_auto': True,
+            'request_archive_closed_after_days': 30,
+        })
+        cron_job = self.env.ref(
+            'generic_request.ir_cron_request_archive_closed')
+
+        with freeze_time('2018-07-20'):
+            cron_job.method_direct_trigger()
+            self.assertTrue(request.active)
+
+        with freeze_time('2018-08-20'):
+            cron_job.method_direct_trigger()
+            self.assertFalse(request.active)
+            self.assertFalse(Request.search([('id', '=', request.id)]))
+            self.assertTrue(request_2.active)
+
+        request.action_request_restore()
+        self.assertTrue(request.active)
+        self.assertTrue(request.closed)
+
+    def test_request_stage_cycle_time(self):
+        Request = self.env['request.request']
+        CycleTime = self.env['request.stage.cycle.time']
+        with freeze_time('2018-07-09 10:00:00'):
+            request = Request.create({
+                'type_id': self.simple_type.id,
+                'request_text': 'Test',
+            })
+        with freeze_time('2018-07-09 14:00:00'):
+            request.stage_id = self.stage_sent
+        with freeze_time('2018-07-10 14:00:00'):
+            self._close_request(request, self.stage_confirmed)
+
+        rows = CycleTime.search(
+            [('request_id', '=', request.id)], order='date_entered, id')
+        self.assertEqual(
+            rows.mapped('stage_id'),
+            self.stage_draft + self.stage_sent + self.stage_confirmed)
+        self.assertEqual(rows.mapped('duration'), [4.0, 24.0, 0.0])
+        self.assertFalse(rows[-1].date_left)
+
+        # Rebuild rows from events
+        rows.unlink()
+        CycleTime._backfill_from_events()
+        rows = CycleTime.search(
+            [('request_id', '=', request.id)], order='date_entered, id')
+        self.assertEqual(
+            rows.mapped('stage_id'),
+            self.stage_draft + self.stage_sent + self.stage_confirmed)
+        self.assertEqual(rows.mapped('duration'), [4.0, 24.0, 0.0])
+
+        # Only missing stage visits are restored for request,
+        # that already has some rows
+        rows[:2].unlink()
+        CycleTime._backfill_from_events()
+        rows = CycleTime.search(
+            [('request_id', '=', request.id)], order='date_entered, id')
+        self.assertEqual(
+            rows.mapped('stage_id'),
+            self.stage_draft + self.stage_sent + self.stage_confirmed)
+        self.assertEqual(rows.mapped('duration'), [4.0, 24.0, 0.0])
+
+        report = self.env['request.stage.cycle.time.report'].search([
+            ('request_type_id', '=', self.simple_type.id),
+            ('stage_id', '=', self.stage_sent.id),
+        ])
+        self.assertEqual(len(report), 1)
+        self.assertGreaterEqual(report.visit_count, 1)
+        self.assertGreaterEqual(report.duration_max, 24.0)
+
+    def test_request_duplicate_detection(self):
+        Request = self.env['request.request']
+        text = (
+            "<p>Hello. My laptop does not start after the last update. "
+            "The screen stays black and the power led is blinking. "
+            "Please, help me to fix it as soon as possible.</p>")
+        request = Request.create({
+            'type_id': self.simple_type.id,
+            'request_text': text,
+        })
+        self.assertFalse(request.duplicate_of_id)
+
+        duplicate = Request.create({
+            'type_id': self.simple_type.id,
+            'request_text': text.replace("Hello.", "Hello!"),
+        })
+        self.assertEqual(duplicate.duplicate_of_id, request)
+
+        other = Request.create({
+            'type_id': self.simple_type.id,
+            'request_text': "<p>Please, create account for new employee</p>",
+        })
+        self.assertFalse(other.duplicate_of_id)
+
+        # Index is updated when request text changed
+        other.request_text = text
+        self.assertEqual(
+            self.env['request.request.lsh'].search_count(
+                [('request_id', '=', other.id)]),
+            self.env['request.request.lsh'].search_count(
+                [('request_id', '=', request.id)]))
+
+    def test_request_inline_images(self):
+        image = (
+            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk"
+            "YPhfDwAChwGA60e6kgAAAABJRU5ErkJggg==")
+        img_tag = '<img src="data:image/png;base64,%s"/>' % image
+        request = self.env['request.request'].create({
+            'type_id': self.simple_type.id,
+            'request_text': '<p>Test %s and %s</p>' % (img_tag, img_tag),
+        })
+        attachments = self.env['ir.attachment'].search([
+            ('res_model', '=', 'request.request'),
+            ('res_id', '=', request.id),
+        ])
+        self.assertEqual(len(attachments), 1)
+        self.assertNotIn('base64', request.request_text)
+        self.assertEqual(
+            request.request_text.count('/web/image/%s' % attachments.id), 2)
+
+        # Same image is not attached twice
+        request.request_text = '<p>Updated %s</p>' % img_tag
+        self.assertEqual(
+            self.env['ir.attachment'].search_count([
+                ('res_model', '=', 'request.request'),
+                ('res_id', '=', request.id),
+            ]), 1)
+        self.assertIn('/web/image/%s' % attachments.id, request.request_text)
+
+        # Migrate requests that already have inline images
+        request.flush()
+        self.env.cr.execute("""
+            UPDATE request_request SET request_text = %s WHERE id = %s
+        """, ('<p>Old %s</p>' % img_tag, request.id))
+        request.invalidate_cache()
+        self.env['request.request']._scheduler_extract_inline_images()
+        self.assertNotIn('base64', request.request_text)
+        self.assertIn('/web/image/%s' % attachments.id, request.request_text)
+
+    def test_request_handler_stats(self):
+        handler_stats.reset_stats()
+        request = self.env['request.request'].create({
+            'type_id': self.simple_type.id,
+            'request_text': 'Test',
+        })
+        request.stage_id = self.stage_sent
+        self.assertFalse(handler_stats.get_stats())
+
+        self.env['ir.config_parameter'].sudo().set_param(
+            handler_stats.HANDLER_STATS_PARAM, 'True')
+        self._close_request(request, self.stage_confirmed)
+        stats = {
+            s['handler']: s
+            for s in handler_stats.get_stats()
+            if s['model'] == 'request.request'
+        }
+        self.assertEqual(stats['_before_stage_id_changed']['call_count'], 1)
+        self.assertEqual(stats['_after_stage_id_changed']['call_count'], 1)
+        self.assertEqual(
+            stats['handle_request_event:closed']['call_count'], 1)
+        self.assertTrue(
+            self.env['generic.mixin.handler.stats'].action_show_stats())
+        handler_stats.reset_stats()
+
+    def test_request_category_complete_name(self):
+        Category = self.env['request.category']
+        parent = Category.create({'name': 'Parent', 'code': 'test-parent'})
+        child = Category.create({
+            'name': 'Child', 'code': 'test-child', 'parent_id': parent.id})
+        sub_child = Category.create({
+            'name': 'Sub', 'code': 'test-sub', 'parent_id': child.id})
+        self.assertEqual(sub_child.complete_name, 'Parent / Child / Sub')
+        self.assertEqual(
+            sub_child.display_name, 'Parent / Child / Sub')
+
+        parent.name = 'Root'
+        self.assertEqual(child.complete_name, 'Root / Child')
+        self.assertEqual(sub_child.complete_name, 'Root / Child / Sub')
+
+        sub_child.parent_id = parent
+        self.assertEqual(sub_child.complete_name, 'Root / Sub')
+
+        self.assertEqual(
+            [r[0] for r in Category.name_search('Root / Chi')],
+            [child.id])
+        self.assertIn(
+            child.id, [r[0] for r in Category.name_search('Child')])
+
+        # Path search does not find descendants of matched records
+        sub_child_2 = Category.create({
+            'name': 'Sub 2', 'code': 'test-sub-2', 'parent_id': child.id})
+        self.assertEqual(
+            [r[0] for r in Category.name_search('Root / Child')],
+            [child.id])
+        self.assertEqual(
+            [r[0] for r in Category.name_search('root / child / sub')],
+            [sub_child_2.id])
+        self.assertFalse(Category.name_search('Child / Sub'))
+
+        # Plain names are searched in any part of name
+        self.assertEqual(
+            set(r[0] for r in Category.name_search(
+                'ub', args=[('id', 'in', (sub_child | sub_child_2).ids)])),
+            set((sub_child | sub_child_2).ids))
+
+        # New records (for example in onchange) have no complete name yet
+        new_child = Category.new({'name': 'New', 'parent_id': parent.id})
+        self.assertEqual(new_child.name_get()[0][1], 'Root / New')
+
     def test_request_kind_menuitem_toggle(self):
         self.assertFalse(self.request_kind.menuitem_toggle)
         self.assertFalse(self.request_kind.menuitem_name)
@@ -232,3 +232,34 @@ class TestRequestAuthor(RequestCase):
                 'generic_request.request_request_type_sequence_demo_1'
             ).partner_id,
             self.env.ref('base.res_partner_2'))
+
+    def test_partner_request_ids(self):
+        partner2 = self.env.ref('base.res_partner_2')
+        request = self.env['request.request'].create({
+            'type_id': self.simple_type.id,
+            'author_id': self.author1.id,
+            'request_text': 'Test request',
+        })
+        self.assertEqual(request.partner_id, self.partner1)
+        self.assertIn(request, self.author1.request_ids)
+        self.assertIn(request, self.partner1.request_ids)
+        self.assertNotIn(request, partner2.request_ids)
+        partner1_count = self.partner1.request_count
+
+        request.partner_id = partner2
+        self.assertIn(request, self.author1.request_ids)
+        self.assertNotIn(request, self.partner1.request_ids)
+        self.assertIn(request, partner2.request_ids)
+        self.assertEqual(self.partner1.request_count, partner1_count - 1)
+
+        # Break relation and repair it
+        self.env.cr.execute("""
+            DELETE FROM request_request_partner_author_rel
+            WHERE request_id = %s
+        """, (request.id,))
+        self.env['res.partner'].invalidate_cache()
+        self.assertNotIn(request, partner2.request_ids)
+
+        self.env['res.partner']._request_partner_rel_rebuild()
+        self.assertIn(request, self.author1.request_ids)
+        self.assertIn(request, partner2.request_ids)
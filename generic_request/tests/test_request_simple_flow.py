@@ -238,3 +238,47 @@ class TestRequestSimpleFlow(RequestCase):
         # Assign request to manager
         with self.assertRaises(UserError):
             self.request_1.action_request_assign()
+
+    def test_170_simple_flow_mass_action(self):
+        requests = self.env['request.request'].create([{
+            'type_id': self.simple_type.id,
+            'request_text': 'Mass action test %s' % i,
+        } for i in range(5)])
+        # Request of other type, there is no route to 'sent' stage of
+        # simple type for it
+        requests_bad = self.request_2
+        self.assertTrue(all(r.stage_id == self.stage_draft for r in requests))
+
+        wizard = self.env['request.wizard.mass.action'].create({
+            'request_ids': [(6, 0, (requests + requests_bad).ids)],
+            'stage_id': self.stage_sent.id,
+            'user_id': self.request_manager.id,
+            'chunk_size': 2,
+        })
+        wizard.do_apply()
+
+        self.assertEqual(wizard.state, 'done')
+        self.assertEqual(wizard.done_count, 5)
+        self.assertEqual(wizard.failed_count, 1)
+        self.assertIn(requests_bad.name, wizard.result_text)
+        for request in requests:
+            self.assertEqual(request.stage_id, self.stage_sent)
+            self.assertEqual(request.user_id, self.request_manager)
+            self.assertEqual(request.last_route_id, self.route_draft_to_sent)
+        self.assertNotEqual(requests_bad.stage_id, self.stage_sent)
+
+        # Requests moved to closed stage cannot be assigned
+        wizard = self.env['request.wizard.mass.action'].create({
+            'request_ids': [(6, 0, requests.ids)],
+            'stage_id': self.stage_rejected.id,
+            'user_id': self.demo_user.id,
+            'chunk_size': 2,
+        })
+        self.assertEqual(wizard.request_count, 5)
+        wizard.do_apply()
+
+        self.assertEqual(wizard.done_count, 0)
+        self.assertEqual(wizard.failed_count, 5)
+        for request in requests:
+            self.assertEqual(request.stage_id, self.stage_sent)
+            self.assertEqual(request.user_id, self.request_manager)
@@ -0,0 +1,260 @@
+from odoo import exceptions
+from odoo.addons.generic_tag.models.generic_tag import (
+    _tag_facet_counts_cache,
+)
+
+from .common import RequestCase
+
+
+class TestRequestTags(RequestCase):
+    """ Test generic tags on requests
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestRequestTags, cls).setUpClass()
+        cls.tag_model = cls.env.ref(
+            'generic_request.generic_request_tag_model')
+        cls.tag_low = cls.env.ref('generic_request.tag_severity_low')
+        cls.tag_high = cls.env.ref('generic_request.tag_severity_high')
+        cls.tag_linux = cls.env.ref('generic_request.tag_platform_linux')
+
+    def _count_queries(self, func):
+        start = self.env.cr.sql_log_count
+        func()
+        return self.env.cr.sql_log_count - start
+
+    def test_tag_objects_count(self):
+        Tag = self.env['generic.tag']
+        tags = Tag.create([{
+            'name': 'Test tag %s' % i,
+            'model_id': self.tag_model.id,
+        } for i in range(20)])
+        self.request_1.tag_ids |= tags[:3]
+        self.request_2.tag_ids |= tags[:1]
+
+        def compute_counts(tags):
+            tags.invalidate_cache(['objects_count'])
+            tags.mapped('objects_count')
+
+        few_queries = self._count_queries(lambda: compute_counts(tags[:2]))
+        many_queries = self._count_queries(lambda: compute_counts(tags))
+        self.assertEqual(few_queries, many_queries)
+
+        self.assertEqual(tags[0].objects_count, 2)
+        self.assertEqual(tags[1].objects_count, 1)
+        self.assertEqual(tags[3].objects_count, 0)
+
+        # Archived requests are not counted
+        self.request_2.active = False
+        tags.invalidate_cache(['objects_count'])
+        self.assertEqual(tags[0].objects_count, 1)
+
+    def test_search_no_tag_id(self):
+        Request = self.env['request.request']
+        requests = self.request_1 | self.request_2
+        self.request_1.tag_ids |= self.tag_linux
+
+        domain = [('id', 'in', requests.ids)]
+        self.assertEqual(
+            Request.search(
+                domain + [('search_no_tag_id', '=', self.tag_linux.id)]),
+            self.request_2)
+        self.assertEqual(
+            Request.search(
+                domain + [('search_no_tag_id', 'ilike', 'Linux')]),
+            self.request_2)
+        self.assertEqual(
+            Request.search(
+                domain + [('search_tag_id', '=', self.tag_linux.id)]),
+            self.request_1)
+
+        # Negative operators find records that have matching tags
+        self.assertEqual(
+            Request.search(
+                domain + [('search_no_tag_id', '!=', self.tag_linux.id)]),
+            self.request_1)
+        self.assertEqual(
+            Request.search(
+                domain + [('search_no_tag_id', 'not ilike', 'Linux')]),
+            self.request_1)
+        self.assertEqual(
+            Request.search(
+                domain + [('search_no_tag_id', 'not in', [])]),
+            Request.browse())
+        self.assertEqual(
+            Request.search(
+                domain + [('search_no_tag_id', 'ilike', 'no such tag')]),
+            requests)
+
+        # Comparison with False finds records with or without any tags
+        self.request_2.tag_ids = False
+        self.assertEqual(
+            Request.search(domain + [('search_no_tag_id', '=', False)]),
+            self.request_1)
+        self.assertEqual(
+            Request.search(domain + [('search_no_tag_id', '!=', False)]),
+            self.request_2)
+
+    def test_add_remove_check_tag(self):
+        requests = self.request_1 | self.request_2
+        requests.remove_tag(code='platform_windows')
+        self.assertFalse(requests.check_tag(code='platform_windows'))
+
+        requests.add_tag(code='platform_windows')
+        self.assertTrue(requests.check_tag(code='platform_windows'))
+        self.assertTrue(
+            self.request_2.check_tag(name='Windows'))
+
+        self.request_2.remove_tag(code='platform_windows')
+        self.assertFalse(requests.check_tag(code='platform_windows'))
+        self.assertTrue(self.request_1.check_tag(code='platform_windows'))
+
+        # Cached lookup have to be reset when tag changed
+        tag = self.env['generic.tag'].get_tags(
+            'request.request', code='platform_windows')
+        tag.code = 'platform_windows_new'
+        self.assertFalse(
+            self.env['generic.tag'].get_tags(
+                'request.request', code='platform_windows'))
+        self.assertEqual(
+            self.env['generic.tag'].get_tags(
+                'request.request', code='platform_windows_new'),
+            tag)
+
+        requests.add_tag(code='test_new_tag', name='New Tag', create=True)
+        self.assertTrue(requests.check_tag(code='test_new_tag'))
+
+    def test_get_tags_sudo_cache(self):
+        Tag = self.env['generic.tag']
+        group = self.env['res.groups'].create({'name': 'Test Tag Group'})
+        tag = Tag.create({
+            'name': 'Test restricted tag',
+            'code': 'test_restricted_tag',
+            'model_id': self.tag_model.id,
+            'group_ids': [(6, 0, group.ids)],
+        })
+        user = self.env['res.users'].create({
+            'name': 'Test Tag User',
+            'login': 'test-tag-user',
+            'groups_id': [(6, 0, self.env.ref('base.group_user').ids)],
+        })
+        UserTag = Tag.with_user(user)
+
+        # Call as restricted user first, then with sudo
+        self.assertFalse(UserTag.get_tags(
+            'request.request', code='test_restricted_tag'))
+        self.assertEqual(
+            UserTag.sudo().get_tags(
+                'request.request', code='test_restricted_tag'),
+            tag)
+
+        # Call with sudo first, then as restricted user
+        Tag.clear_caches()
+        self.assertEqual(
+            UserTag.sudo().get_tags(
+                'request.request', code='test_restricted_tag'),
+            tag)
+        self.assertFalse(UserTag.get_tags(
+            'request.request', code='test_restricted_tag'))
+
+    def test_tags_xor(self):
+        requests = self.request_1 | self.request_2
+        requests.write({'tag_ids': [(5, 0), (4, self.tag_low.id)]})
+
+        with self.assertRaisesRegex(
+                exceptions.ValidationError,
+                r"\[Severity - Low, High\]"):
+            self.request_1.write({'tag_ids': [(4, self.tag_high.id)]})
+
+        # Tags of other categories are allowed
+        requests.write({'tag_ids': [(4, self.tag_linux.id)]})
+        self.assertTrue(requests.check_tag(code='platform_linux'))
+
+    def test_wizard_manage_tags(self):
+        Wizard = self.env['generic.tag.wizard.manage.tags']
+        requests = self.request_1 | self.request_2
+        requests.remove_tag(code='platform_windows')
+        windows = self.env.ref('generic_request.tag_platform_windows')
+
+        processed = Wizard.apply_tags(
+            'request.request', requests.ids, windows.ids,
+            action='add', chunk_size=1)
+        self.assertEqual(processed, 2)
+        self.assertTrue(requests.check_tag(code='platform_windows'))
+
+        wizard = Wizard.with_context(
+            manage_tags_model='request.request',
+            manage_tags_object_ids=requests.ids,
+        ).create({
+            'tag_ids': [(6, 0, windows.ids)],
+            'action': 'remove',
+            'chunk_size': 1,
+        })
+        wizard.do_apply()
+        self.assertEqual(wizard.state, 'done')
+        self.assertEqual(wizard.total_count, 2)
+        self.assertEqual(wizard.processed_count, 2)
+        self.assertFalse(requests.check_tag(code='platform_windows'))
+
+    def test_tag_facet_counts(self):
+        Request = self.env['request.request']
+        requests = self.request_1 | self.request_2
+        requests.write({'tag_ids': [(5, 0), (4, self.tag_linux.id)]})
+        self.request_1.write({'tag_ids': [(4, self.tag_low.id)]})
+
+        counts = Request.get_tag_facet_counts(
+            [('id', 'in', requests.ids)])
+        self.assertEqual(counts, {
+            self.tag_linux.id: 2,
+            self.tag_low.id: 1,
+        })
+        self.assertEqual(
+            Request._get_tag_facet_counts(
+                [('id', '=', self.request_2.id)]),
+            {self.tag_linux.id: 1})
+
+    def test_tag_facet_counts_search_panel(self):
+        Request = self.env['request.request']
+        requests = self.request_1 | self.request_2
+        requests.write({'tag_ids': [(5, 0), (4, self.tag_linux.id)]})
+        self.request_1.write({'tag_ids': [(4, self.tag_low.id)]})
+        search_domain = [('id', 'in', requests.ids)]
+
+        res = Request.search_panel_select_multi_range(
+            'tag_ids', search_domain=search_domain,
+            enable_counters=True, expand=False)
+        self.assertEqual(
+            {v['id']: v['__count'] for v in res['values']},
+            {self.tag_linux.id: 2, self.tag_low.id: 1})
+
+        # Without counters, only tags that have records are returned
+        res = Request.search_panel_select_multi_range(
+            'tag_ids', search_domain=search_domain,
+            enable_counters=False, expand=False)
+        self.assertEqual(
+            {v['id'] for v in res['values']},
+            {self.tag_linux.id, self.tag_low.id})
+        self.assertFalse(any('__count' in v for v in res['values']))
+
+        # With expand, tags without records are returned too
+        res = Request.search_panel_select_multi_range(
+            'tag_ids', search_domain=search_domain,
+            enable_counters=True, expand=True)
+        counts = {v['id']: v['__count'] for v in res['values']}
+        self.assertEqual(counts[self.tag_linux.id], 2)
+        self.assertEqual(counts[self.tag_high.id], 0)
+
+        # Number of queries does not depend on number of tags
+        def search_panel():
+            _tag_facet_counts_cache.clear()
+            Request.search_panel_select_multi_range(
+                'tag_ids', search_domain=search_domain,
+                enable_counters=True, expand=False)
+
+        queries = self._count_queries(search_panel)
+        self.env['generic.tag'].create([{
+            'name': 'Test tag %s' % i,
+            'model_id': self.tag_model.id,
+        } for i in range(10)])
+        self.assertEqual(self._count_queries(search_panel), queries)
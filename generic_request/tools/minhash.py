@@ -0,0 +1,96 @@
+""" Simple MinHash / LSH helpers used to find near-duplicate requests.
+
+    Text is normalized and split to word shingles, then MinHash signature
+    is computed for set of shingles. Signature is split to bands, and each
+    band is hashed to single integer. Requests that have at least one
+    equal band hash are candidates to be duplicates.
+"""
+import re
+import random
+import struct
+import hashlib
+
+from .utils import html2text
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+RE_WORD = re.compile(r'\w+', re.UNICODE)
+
+# Permutations have to be same for all processes, thus use fixed seed
+_rnd = random.Random(42)
+PERMUTATIONS = [
+    (_rnd.randint(1, MERSENNE_PRIME - 1), _rnd.randint(0, MERSENNE_PRIME - 1))
+    for __ in range(128)
+]
+del _rnd
+
+
+def _hash32(data):
+    return struct.unpack(
+        '<I', hashlib.blake2b(data, digest_size=4).digest())[0]
+
+
+def text_shingles(text, size=3, is_html=True):
+    """ Return set of word shingles of normalized text
+
+        :param str text: text to compute shingles for
+        :param int size: number of words in single shingle
+        :param bool is_html: if set, then text will be converted from html
+        :return set: set of 32-bit hashes of shingles
+    """
+    if is_html:
+        text = html2text(text)
+    words = RE_WORD.findall((text or '').lower())
+    if not words:
+        return set()
+    if len(words) <= size:
+        return {_hash32(' '.join(words).encode('utf-8'))}
+    return {
+        _hash32(' '.join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash_signature(shingles, num_perm=64):
+    """ Compute MinHash signature for set of shingles
+
+        :return list: list of num_perm integers
+    """
+    if not shingles:
+        return []
+    return [
+        min(((a * s + b) % MERSENNE_PRIME) & MAX_HASH for s in shingles)
+        for a, b in PERMUTATIONS[:num_perm]
+    ]
+
+
+def lsh_band_hashes(signature, bands=16):
+    """ Split signature to bands and compute hash of each band.
+
+        Index of band is included in hash, thus equal hashes mean
+        equal values of same band. Hashes fit signed 32-bit integer, to be
+        stored in regular Integer field.
+
+        :return list: list of band hashes
+    """
+    if not signature:
+        return []
+    rows = len(signature) // bands
+    res = []
+    for band in range(bands):
+        data = struct.pack(
+            '<%dI' % (rows + 1),
+            band, *signature[band * rows:(band + 1) * rows])
+        res.append(struct.unpack(
+            '<i', hashlib.blake2b(data, digest_size=4).digest())[0])
+    return res
+
+
+def jaccard_similarity(shingles_a, shingles_b):
+    """ Compute exact Jaccard similarity of two sets of shingles
+    """
+    if not shingles_a or not shingles_b:
+        return 0.0
+    return (
+        len(shingles_a & shingles_b) / float(len(shingles_a | shingles_b)))
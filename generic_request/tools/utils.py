@@ -1,3 +1,4 @@
+import re
 import logging
 _logger = logging.getLogger(__name__)
 
@@ -20,3 +21,19 @@ def html2text(html):
     ht.ignore_emphasis = True
     ht.ignore_links = True
     return ht.handle(html)
+
+
+# Inline (base64-encoded) raster images in 'src' attribute of <img> tags.
+# Groups: 1 - start of tag, 2 - mimetype, 3 - base64 data, 4 - closing quote
+INLINE_IMAGE_RE = re.compile(
+    r"""(<img\b[^>]*?\bsrc\s*=\s*["'])"""
+    r"""data:(image/(?:png|jpe?g|gif|webp|bmp));base64,([A-Za-z0-9+/=\s]+)"""
+    r"""(["'])""",
+    re.IGNORECASE)
+
+
+def has_inline_images(html):
+    """ Check if html contains inline base64-encoded images
+    """
+    return bool(html) and 'base64,' in html and bool(
+        INLINE_IMAGE_RE.search(html))
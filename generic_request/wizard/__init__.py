@@ -1,3 +1,4 @@
 from . import request_wizard_close
 from . import request_wizard_assign
 from . import request_wizard_stop_work
+from . import request_wizard_mass_action
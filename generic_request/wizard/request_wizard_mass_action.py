@@ -0,0 +1,210 @@
+import logging
+import threading
+import collections
+
+from odoo import models, fields, api, exceptions, _
+from odoo.tools import ustr, split_every
+
+_logger = logging.getLogger(__name__)
+
+
+class RequestWizardMassAction(models.TransientModel):
+    """ Move and/or reassign large amount of requests.
+
+        Routes are validated once per (type, stage_from, stage_to) group,
+        and requests are written by chunks, each chunk in separate
+        savepoint (and committed separately when not in test mode).
+        Errors of single requests do not abort whole batch, instead
+        they are reported in 'result_text' field.
+
+        This wizard could be used from server actions or crons too:
+
+            env['request.wizard.mass.action'].create({
+                'request_ids': [(6, 0, requests.ids)],
+                'stage_id': stage.id,
+            }).do_apply()
+    """
+    _name = 'request.wizard.mass.action'
+    _description = 'Request Wizard: Mass Action'
+
+    request_ids = fields.Many2many(
+        'request.request', string='Requests', required=True)
+    request_count = fields.Integer(
+        compute='_compute_request_count', readonly=True)
+    stage_id = fields.Many2one(
+        'request.stage', string="Move to",
+        help="Move selected requests to this stage")
+    user_id = fields.Many2one(
+        'res.users', string="Assign to",
+        help="Assign selected requests to this user")
+    chunk_size = fields.Integer(
+        default=100, required=True,
+        help="Number of requests processed in single transaction")
+
+    state = fields.Selection(
+        [('draft', 'Draft'),
+         ('done', 'Done')],
+        required=True, default='draft', readonly=True)
+    done_count = fields.Integer(readonly=True)
+    failed_count = fields.Integer(readonly=True)
+    result_text = fields.Text(readonly=True)
+
+    _sql_constraints = [
+        ('chunk_size_positive',
+         'CHECK (chunk_size > 0)',
+         'Chunk size must be positive'),
+    ]
+
+    @api.depends('request_ids')
+    def _compute_request_count(self):
+        for rec in self:
+            rec.request_count = len(rec.request_ids)
+
+    def _prepare_write_vals(self):
+        self.ensure_one()
+        vals = {}
+        if self.stage_id:
+            vals['stage_id'] = self.stage_id.id
+        if self.user_id:
+            vals['user_id'] = self.user_id.id
+        return vals
+
+    def _group_requests_by_route(self, requests):
+        """ Group requests by route that have to be used to move them.
+
+            Routes are searched and checked once per group of requests
+            with same type and stage.
+
+            :return tuple: (groups, failures), where groups is list of
+                           tuples (route, requests) and failures is dict
+                           {request: error message}
+        """
+        self.ensure_one()
+        Route = self.env['request.stage.route']
+
+        grouped = collections.defaultdict(self.env['request.request'].browse)
+        for request in requests:
+            grouped[(request.type_id, request.stage_id)] |= request
+
+        groups = []
+        failures = {}
+        for (__, stage_from), reqs in grouped.items():
+            if not self.stage_id or stage_from == self.stage_id:
+                groups.append((Route.browse(), reqs))
+                continue
+
+            try:
+                route = Route.ensure_route(reqs[0], self.stage_id.id)
+            except (exceptions.AccessError,
+                    exceptions.ValidationError) as exc:
+                for request in reqs:
+                    failures[request] = ustr(exc)
+            else:
+                groups.append((route, reqs))
+        return groups, failures
+
+    def _apply_to_chunk(self, route, requests, vals, failures):
+        """ Apply vals to chunk of requests in single savepoint.
+            If chunk fails, then retry requests one by one to find out
+            failed ones.
+
+            :return int: number of processed requests
+        """
+        requests = requests.with_context(request_stage_route_id=route.id)
+        try:
+            with self.env.cr.savepoint():
+                requests.write(vals)
+                if vals.get('user_id'):
+                    # Check after write, because requests could be moved
+                    # to stage where assignee cannot be changed
+                    requests.ensure_can_assign()
+        except Exception:  # pylint: disable=broad-except
+            _logger.debug(
+                "Cannot process chunk of requests %s. "
+                "Processing requests one by one.", requests, exc_info=True)
+        else:
+            return len(requests)
+
+        done = 0
+        for request in requests:
+            try:
+                with self.env.cr.savepoint():
+                    request.write(vals)
+                    if vals.get('user_id'):
+                        request.ensure_can_assign()
+            except Exception as exc:  # pylint: disable=broad-except
+                failures[request] = ustr(exc)
+            else:
+                done += 1
+        return done
+
+    def _format_result_text(self, failures):
+        return "\n".join(
+            "%s: %s" % (request.sudo().display_name, message)
+            for request, message in failures.items())
+
+    def do_apply(self, auto_commit=None):
+        """ Apply changes to selected requests
+
+            :param bool auto_commit: commit transaction after each chunk.
+                                     By default, commits are enabled
+                                     only when not in test mode.
+        """
+        self.ensure_one()
+        if auto_commit is None:
+            auto_commit = not getattr(
+                threading.currentThread(), 'testing', False)
+
+        vals = self._prepare_write_vals()
+        if not vals:
+            raise exceptions.UserError(_(
+                "Please, select stage to move requests to "
+                "or user to assign requests to!"))
+
+        groups, failures = self._group_requests_by_route(self.request_ids)
+        done = 0
+        for route, requests in groups:
+            for chunk in split_every(self.chunk_size, requests.ids,
+                                     requests.browse):
+                done += self._apply_to_chunk(route, chunk, vals, failures)
+                if auto_commit:
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+
+        self.write({
+            'state': 'done',
+            'done_count': done,
+            'failed_count': len(failures),
+            'result_text': self._format_result_text(failures),
+        })
+        if auto_commit:
+            self.env.cr.commit()  # pylint: disable=invalid-commit
+
+        # Reopen wizard to display results
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    @api.model
+    def mass_move_requests(self, request_ids, stage_id=None, user_id=None,
+                           chunk_size=100):
+        """ RPC-friendly shortcut to move and/or reassign requests
+
+            :return dict: number of processed and failed requests, and
+                          text describing errors for failed ones
+        """
+        wizard = self.create({
+            'request_ids': [(6, 0, request_ids)],
+            'stage_id': stage_id,
+            'user_id': user_id,
+            'chunk_size': chunk_size,
+        })
+        wizard.do_apply()
+        return {
+            'done': wizard.done_count,
+            'failed': wizard.failed_count,
+            'errors': wizard.result_text,
+        }
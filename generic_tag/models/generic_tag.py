@@ -1,11 +1,21 @@
 import logging
 import collections
 
-from odoo import models, fields, api, exceptions, _
+from odoo import models, fields, api, tools, exceptions, _
 from odoo.osv import expression
 
+from odoo.addons.generic_mixin.tools.ttl_cache import (
+    TTLCache,
+    env_cache_key,
+)
+
 _logger = logging.getLogger(__name__)
 
+# Tag facet counts (see 'GenericTagMixin.get_tag_facet_counts') are cached
+# per worker for TAG_FACET_COUNTS_TTL seconds
+TAG_FACET_COUNTS_TTL = 60
+_tag_facet_counts_cache = TTLCache(TAG_FACET_COUNTS_TTL)
+
 
 def ensure_code_or_name(code, name):
     if not (bool(code) or bool(name)):
@@ -61,18 +71,62 @@ class GenericTag(models.Model):
 
     @api.depends()
     def _compute_objects_count(self):
+        tags_by_model = collections.defaultdict(self.browse)
         for tag in self:
-            if not tag.id:
-                tag.objects_count = 0
-                continue
+            tag.objects_count = 0
+            if tag.id:
+                tags_by_model[tag.model_id.model] |= tag
 
-            try:
-                TagModel = self.env[tag.model_id.model]
-            except KeyError:
-                tag.objects_count = 0
-            else:
-                tag.objects_count = TagModel.search_count(
-                    [('tag_ids.id', '=', tag.id)])
+        for model_name, tags in tags_by_model.items():
+            counts = tags._get_objects_count(model_name)
+            for tag in tags:
+                tag.objects_count = counts.get(tag.id, 0)
+
+    def _get_objects_count(self, model_name):
+        """ Count objects of model 'model_name' related to tags in self
+            with single grouped query on tag relation table.
+
+            Objects that are not visible to current user (because of
+            record rules or because they are archived) are not counted.
+
+            :return dict: {tag_id: objects_count}
+        """
+        try:
+            TagModel = self.env[model_name]
+        except KeyError:
+            return {}
+
+        field = TagModel._fields.get('tag_ids')
+        if not field or field.type != 'many2many' or not field.store:
+            return {}
+        if not TagModel.check_access_rights('read', raise_exception=False):
+            return {}
+
+        TagModel.flush()
+        query = TagModel._where_calc([])
+        TagModel._apply_ir_rules(query, 'read')
+        from_clause, where_clause, where_params = query.get_sql()
+
+        sql = """
+            SELECT rel."{tag_col}", COUNT(*)
+            FROM "{rel}" AS rel
+            WHERE rel."{tag_col}" IN %s
+        """.format(rel=field.relation, tag_col=field.column2)
+        params = [tuple(self.ids)]
+        if where_clause:
+            # Only records visible to current user have to be counted
+            sql += """
+              AND rel."{rec_col}" IN (
+                  SELECT "{table}".id FROM {from_clause} WHERE {where})
+            """.format(rec_col=field.column1, table=TagModel._table,
+                       from_clause=from_clause, where=where_clause)
+            params += where_params
+        sql += """
+            GROUP BY rel."{tag_col}"
+        """.format(tag_col=field.column2)
+
+        self.env.cr.execute(sql, params)  # pylint: disable=sql-injection
+        return dict(self.env.cr.fetchall())
 
     @api.depends('category_id.name', 'name')
     def _compute_complete_name(self):
@@ -117,18 +171,53 @@ class GenericTag(models.Model):
 
         return tags.name_get()
 
+    # Fields, changes of which have to reset cache of tag lookups
+    _tag_lookup_fields = ('name', 'code', 'model_id', 'active', 'group_ids')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        tags = super(GenericTag, self).create(vals_list)
+        self.clear_caches()
+        return tags
+
+    def write(self, vals):
+        res = super(GenericTag, self).write(vals)
+        if set(vals) & set(self._tag_lookup_fields):
+            self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super(GenericTag, self).unlink()
+        self.clear_caches()
+        return res
+
     @api.model
-    @api.returns('self')
-    def get_tags(self, model, code=None, name=None):
-        """ Search for tags by model, code, name
+    @tools.ormcache('self.env.uid', 'self.env.su', 'self.env.lang',
+                    'self.env.context.get("active_test", True)',
+                    'model', 'code', 'name')
+    def _get_tag_ids(self, model, code=None, name=None):
+        """ Find ids of tags by model, code, name.
+
+            Results are cached per user and superuser mode (because of
+            record rules) and language (because tag names are translatable).
+            Cache is cleared on any change of tags.
+
+            :return tuple: ids of tags found
         """
-        ensure_code_or_name(code, name)
         tag_domain = [('model_id.model', '=', model)]
         if code is not None:
             tag_domain.append(('code', '=', code))
         if name is not None:
             tag_domain.append(('name', '=', name))
-        return self.search(tag_domain)
+        return tuple(self.search(tag_domain).ids)
+
+    @api.model
+    @api.returns('self')
+    def get_tags(self, model, code=None, name=None):
+        """ Search for tags by model, code, name
+        """
+        ensure_code_or_name(code, name)
+        return self.browse(self._get_tag_ids(model, code=code, name=name))
 
     def action_show_objects(self):
         self.ensure_one()
@@ -150,34 +239,119 @@ class GenericTagMixin(models.AbstractModel):
     _name = "generic.tag.mixin"
     _description = "Generic Tag Mixin"
 
+    def _get_tags_xor_violations(self):
+        """ Find records in self, that have more than one tag
+            of category with 'check_xor' restriction.
+
+            :return dict: {record_id: [(category_id, [tag_ids])]}
+        """
+        field = self._fields['tag_ids']
+        self.flush(['tag_ids'])
+        self.env['generic.tag'].flush(['category_id', 'active'])
+        self.env['generic.tag.category'].flush(['check_xor'])
+        # pylint: disable=sql-injection
+        self.env.cr.execute("""
+            SELECT rel."{rec_col}",
+                   t.category_id,
+                   ARRAY_AGG(t.id ORDER BY t.id)
+            FROM "{rel}" AS rel
+            JOIN generic_tag AS t ON t.id = rel."{tag_col}"
+            JOIN generic_tag_category AS c ON c.id = t.category_id
+            WHERE rel."{rec_col}" IN %(record_ids)s
+              AND c.check_xor IS TRUE
+              AND t.active IS TRUE
+            GROUP BY rel."{rec_col}", t.category_id
+            HAVING COUNT(*) > 1
+            ORDER BY t.category_id
+        """.format(rel=field.relation,
+                   rec_col=field.column1,
+                   tag_col=field.column2), {
+            'record_ids': tuple(self.ids),
+        })
+        res = collections.defaultdict(list)
+        for record_id, category_id, tag_ids in self.env.cr.fetchall():
+            res[record_id].append((category_id, tag_ids))
+        return res
+
     @api.constrains('tag_ids')
     def _check_tags_xor(self):
+        if not self.ids:
+            return
+        violations = self._get_tags_xor_violations()
         for record in self:
-            categ_counter = collections.defaultdict(
-                self.env['generic.tag'].browse)
-            for tag in record.tag_ids:
-                if tag.category_id.check_xor:
-                    categ_counter[tag.category_id] |= tag
-
-            bad_tags = []
-            for category, tags in categ_counter.items():
-                if len(tags) > 1:
-                    bad_tags.append(
-                        (category, tags)
-                    )
-            if bad_tags:
-                msg_detail = ', '.join(
-                    ('[%s - %s]' % (cat.name, ', '.join(tags.mapped('name')))
-                     for cat, tags in bad_tags)
-                )
-                raise exceptions.ValidationError(
-                    _("Following (category - tags) pairs, "
-                      "break category XOR restriction:\n%s"
-                      "") % msg_detail)
+            if record.id not in violations:
+                continue
+
+            bad_tags = [
+                (self.env['generic.tag.category'].sudo().browse(category_id),
+                 self.env['generic.tag'].sudo().browse(tag_ids))
+                for category_id, tag_ids in violations[record.id]
+            ]
+            msg_detail = ', '.join(
+                ('[%s - %s]' % (cat.name, ', '.join(tags.mapped('name')))
+                 for cat, tags in bad_tags)
+            )
+            raise exceptions.ValidationError(
+                _("Following (category - tags) pairs, "
+                  "break category XOR restriction:\n%s"
+                  "") % msg_detail)
 
     def _search_no_tag_id(self, operator, value):
-        with_tags = self.search([('tag_ids', operator, value)])
-        return [('id', 'not in', with_tags.mapped('id'))]
+        """ Find records that have none of tags matched by (operator, value).
+
+            Negative operators are inverted (as for 'tag_ids' field itself),
+            thus for example ('search_no_tag_id', 'not ilike', 'x') finds
+            records that have some tag with name like 'x'.
+        """
+        negative = operator in expression.NEGATIVE_TERM_OPERATORS
+        field = self._fields['tag_ids']
+        self.flush(['tag_ids'])
+        query = """
+            SELECT r.id
+            FROM "{table}" AS r
+            WHERE {exists} (
+                SELECT 1
+                FROM "{rel}" AS rel
+                WHERE rel."{rec_col}" = r.id
+                  {tag_cond})
+        """
+
+        if value is False:
+            # ('search_no_tag_id', '=', False) finds records with tags,
+            # ('search_no_tag_id', '!=', False) finds records without tags
+            return [('id', 'inselect', (query.format(
+                table=self._table, rel=field.relation,
+                rec_col=field.column1, tag_cond='',
+                exists='NOT EXISTS' if negative else 'EXISTS'), []))]
+
+        if isinstance(value, str):
+            tag_operator = (
+                expression.TERM_OPERATORS_NEGATION[operator]
+                if negative else operator)
+            tag_ids = [
+                t[0] for t in self.env['generic.tag'].name_search(
+                    value,
+                    args=[('model_id.model', '=', self._name)],
+                    operator=tag_operator,
+                    limit=None)]
+        elif isinstance(value, (list, tuple)):
+            tag_ids = [v for v in value if v]
+        else:
+            tag_ids = [value] if value else []
+
+        if not tag_ids:
+            return (
+                expression.FALSE_DOMAIN if negative
+                else expression.TRUE_DOMAIN)
+
+        # Use subquery on relation table, instead of passing list of ids of
+        # all tagged records back to database
+        return [('id', 'inselect', (query.format(
+            table=self._table, rel=field.relation,
+            rec_col=field.column1,
+            tag_cond='AND rel."%s" IN %%s' % field.column2,
+            exists='EXISTS' if negative else 'NOT EXISTS'),
+            [tuple(tag_ids)]))]
 
     def _search_tag_id(self, operator, value):
         return [('tag_ids', operator, value)]
@@ -206,6 +380,8 @@ class GenericTagMixin(models.AbstractModel):
     def add_tag(self, code=None, name=None, create=False):
         """ Adds tag new tag to object.
 
+            Tags are added to all records in self with single write.
+
             @param code: tag.code field to search for
             @param name: tag.name field to search for
             @param create: if True then create tag if not found
@@ -222,32 +398,35 @@ class GenericTagMixin(models.AbstractModel):
                 'model_id': model.id,
             })
 
-        if tags:
+        if tags and self:
             self.write({'tag_ids': [(4, t.id) for t in tags]})
 
     def remove_tag(self, code=None, name=None):
         """ Removes tags specified by code/name
 
+            Tags are removed from all records in self with single write.
+
             @param code: tag.code field to search for
             @param name: tag.name field to search for
         """
         tags = self.env['generic.tag'].get_tags(
             self._name, code=code, name=name)
 
-        if tags:
+        if tags and self:
             self.write({'tag_ids': [(3, t.id) for t in tags]})
 
     def check_tag(self, code=None, name=None):
         """ Check if self have tag with specified code / name
         """
-        ensure_code_or_name(code, name)
-        tag_domain = [('id', 'in', self.ids)]
-        if code is not None:
-            tag_domain.append(('tag_ids.code', '=', code))
-        if name is not None:
-            tag_domain.append(('tag_ids.name', '=', name))
+        tags = self.env['generic.tag'].get_tags(
+            self._name, code=code, name=name)
+        if not tags:
+            return not self
 
-        count = self.search_count(tag_domain)
+        count = self.search_count([
+            ('id', 'in', self.ids),
+            ('tag_ids', 'in', tags.ids),
+        ])
         return bool(count == len(self))
 
     def check_tag_category(self, code=None, name=None):
@@ -263,3 +442,76 @@ class GenericTagMixin(models.AbstractModel):
 
         count = self.search_count(categ_domain)
         return bool(count == len(self))
+
+    @api.model
+    def _get_tag_facet_counts(self, domain):
+        """ Compute number of records matching domain for each tag
+            with single query joined with tag relation table.
+        """
+        field = self._fields['tag_ids']
+        self.flush()
+        query = self._where_calc(domain)
+        self._apply_ir_rules(query, 'read')
+        from_clause, where_clause, where_params = query.get_sql()
+
+        # pylint: disable=sql-injection
+        self.env.cr.execute("""
+            SELECT rel."{tag_col}", COUNT(*)
+            FROM "{rel}" AS rel
+            WHERE rel."{rec_col}" IN (
+                SELECT "{table}".id FROM {from_clause} WHERE {where})
+            GROUP BY rel."{tag_col}"
+        """.format(rel=field.relation,
+                   rec_col=field.column1,
+                   tag_col=field.column2,
+                   table=self._table,
+                   from_clause=from_clause,
+                   where=where_clause or 'TRUE'), where_params)
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def get_tag_facet_counts(self, domain=None):
+        """ Return number of records matching domain for each tag.
+
+            Results are cached for short time (TAG_FACET_COUNTS_TTL seconds)
+            per user and domain.
+
+            :param list domain: domain to filter records
+            :return dict: {tag_id: records count}
+        """
+        domain = domain or []
+        return dict(_tag_facet_counts_cache.get_or_compute(
+            env_cache_key(self.env, self._name, repr(domain)),
+            lambda: self._get_tag_facet_counts(domain)))
+
+    @api.model
+    def search_panel_select_multi_range(self, field_name, **kwargs):
+        """ Use cached tag facet counts for tags in search panel.
+
+            Super is called without counters, because otherwise it runs
+            separate 'search_count' for each tag, and counts are set
+            from cache only for values returned by super.
+            Counts grouped by 'group_by' are computed by super.
+        """
+        if (field_name != 'tag_ids' or
+                not kwargs.get('enable_counters') or
+                kwargs.get('group_by')):
+            return super(
+                GenericTagMixin, self
+            ).search_panel_select_multi_range(field_name, **kwargs)
+
+        res = super(
+            GenericTagMixin, self
+        ).search_panel_select_multi_range(
+            field_name, **dict(kwargs, enable_counters=False))
+        if 'values' not in res:
+            return res
+
+        counts = self.get_tag_facet_counts(expression.AND([
+            kwargs.get('search_domain') or [],
+            kwargs.get('category_domain') or [],
+            kwargs.get('filter_domain') or [],
+        ]))
+        for value in res['values']:
+            value['__count'] = counts.get(value['id'], 0)
+        return res
@@ -1,7 +1,21 @@
+import threading
+
 from odoo import models, fields, api
+from odoo.tools import split_every
 
 
 class GenericTagWizardManageTags(models.TransientModel):
+    """ Add, set or remove tags on (possibly large) set of records.
+
+        Records are processed by chunks, and (when not in test mode)
+        each chunk is committed separately, thus if processing was
+        interrupted, changes made to already processed chunks are kept.
+
+        This wizard could be used from server actions or crons too:
+
+            env['generic.tag.wizard.manage.tags'].apply_tags(
+                'my.model', records.ids, tags.ids, action='add')
+    """
     _name = 'generic.tag.wizard.manage.tags'
     _description = 'Generic Tag Wizard: Manage Tags'
 
@@ -25,17 +39,100 @@ class GenericTagWizardManageTags(models.TransientModel):
          ('set', 'Set'),
          ('remove', 'Remove')],
         required=True, default='add')
+    chunk_size = fields.Integer(
+        default=1000, required=True,
+        help="Number of records processed in single transaction")
+
+    state = fields.Selection(
+        [('draft', 'Draft'),
+         ('done', 'Done')],
+        required=True, default='draft', readonly=True)
+    total_count = fields.Integer(readonly=True)
+    processed_count = fields.Integer(readonly=True)
+
+    _sql_constraints = [
+        ('chunk_size_positive',
+         'CHECK (chunk_size > 0)',
+         'Chunk size must be positive'),
+    ]
+
+    def _prepare_tag_commands(self):
+        self.ensure_one()
+        if self.action == 'add':
+            return [(4, t.id) for t in self.tag_ids]
+        if self.action == 'set':
+            return [(6, 0, self.tag_ids.ids)]
+        if self.action == 'remove':
+            return [(3, t.id) for t in self.tag_ids]
+        return []
 
-    def do_apply(self):
+    def _notify_progress(self):
+        """ Send progress of wizard to current user via bus
+        """
         self.ensure_one()
+        if 'bus.bus' not in self.env:
+            return
+        self.env['bus.bus'].sendone(
+            (self.env.cr.dbname, 'res.partner',
+             self.env.user.partner_id.id),
+            {
+                'type': 'generic_tag_manage_tags_progress',
+                'wizard_id': self.id,
+                'state': self.state,
+                'processed': self.processed_count,
+                'total': self.total_count,
+            })
 
-        records = self.env[self.model_id.model].search(
-            [('id', 'in', self.env.context.get('manage_tags_object_ids', []))])
+    def do_apply(self, auto_commit=None):
+        """ Apply tag changes to records.
+
+            :param bool auto_commit: commit transaction after each chunk.
+                                     By default, commits are enabled
+                                     only when not in test mode.
+        """
+        self.ensure_one()
+        if auto_commit is None:
+            auto_commit = not getattr(
+                threading.currentThread(), 'testing', False)
+
+        if self.state != 'draft':
+            return
+
+        Model = self.env[self.model_id.model]
+        res_ids = Model.search([
+            ('id', 'in',
+             self.env.context.get('manage_tags_object_ids', [])),
+        ]).ids
+        self.write({
+            'total_count': len(res_ids),
+            'processed_count': 0,
+        })
+
+        commands = self._prepare_tag_commands()
+        for chunk in split_every(self.chunk_size, res_ids):
+            Model.browse(chunk).write({'tag_ids': commands})
+            self.processed_count += len(chunk)
+            self._notify_progress()
+            if auto_commit:
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+
+        self.state = 'done'
+        self._notify_progress()
+
+    @api.model
+    def apply_tags(self, model, res_ids, tag_ids, action='add',
+                   chunk_size=1000):
+        """ Shortcut to apply tags to records from server actions or crons
 
-        for record in records:
-            if self.action == 'add':
-                record.tag_ids += self.tag_ids
-            elif self.action == 'set':
-                record.tag_ids = self.tag_ids
-            elif self.action == 'remove':
-                record.tag_ids -= self.tag_ids
+            :return int: number of processed records
+        """
+        wizard = self.with_context(
+            manage_tags_model=model,
+            manage_tags_object_ids=res_ids,
+        ).create({
+            'tag_ids': [(6, 0, tag_ids)],
+            'action': action,
+            'chunk_size': chunk_size,
+        })
+        wizard.do_apply()
+        return wizard.processed_count